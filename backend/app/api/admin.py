@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Query
+from .. import sql_profiler
+
+# Operational endpoints (not part of the booking API); mounted by main.py only with SQL_PROFILE=true
+router = APIRouter()
+
+@router.get("/sql-profile")
+def sql_profile(order_by: str = Query("total", pattern="^(total|p95|p99|max|count|slow)$"),
+                limit: int = Query(50, ge=1, le=1000)):
+    """Statement shapes seen by the SQL profiler, slowest first."""
+    return sql_profiler.profiler.report(order_by=order_by, limit=limit)
+
+@router.post("/sql-profile/reset")
+def reset_sql_profile():
+    sql_profiler.profiler.reset()
+    return {"enabled": True}
@@ -1,23 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy import select, insert, update, bindparam, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from .. import models, schemas, db
-from datetime import datetime
-import uuid
+from typing import Annotated, List, Optional, Tuple
+from collections import Counter, defaultdict
+from common import refs
+from .. import models, schemas, db, group_commit, cache, inventory, idempotency
+from datetime import date
+import base64
+import logging
+import os
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Dependency
 get_db_session = db.get_db
 
+# Upper bound on items per bulk request (keeps IN lists and transactions bounded)
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+# Attempts after a booking_reference unique violation (the write is rolled back and rerun with new refs)
+REF_COLLISION_RETRIES = int(os.getenv("REF_COLLISION_RETRIES", "3"))
+
 # Helper function to generate booking reference
 def generate_booking_reference():
-    # Example: BK-20250928-UUID4
-    return f"BK-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8]}"
+    # time-ordered, e.g. BK-01K7QW3F5C8V9R2M6N4T1XZ0AB (see common/refs.py)
+    return refs.new_booking_reference()
 
-# ----------------- BOOK -----------------
-@router.post("/book-flight", response_model=schemas.BookingResponse)
-def book_flight(booking: schemas.BookingCreate, db: Session = Depends(get_db_session)):
+def is_reference_collision(error: IntegrityError) -> bool:
+    # SQLite names the column, PostgreSQL the ix_bookings_booking_reference index
+    return "booking_reference" in str(error.orig)
+
+def retry_reference_collisions(attempt, rollback=None):
+    """
+    Run attempt() (a write plus its commit) and rerun it if the insert hit an existing
+    booking_reference, after rollback() has discarded the failed transaction. Every rerun
+    draws fresh references; any other IntegrityError propagates unchanged.
+    """
+    for n in range(REF_COLLISION_RETRIES + 1):
+        try:
+            return attempt()
+        except IntegrityError as e:
+            if n == REF_COLLISION_RETRIES or not is_reference_collision(e):
+                raise
+            if rollback is not None:
+                rollback()
+
+BOOKING_FIELDS = ("booking_reference", "status", "passenger_name", "origin", "destination", "date", "time", "version",
+                  "flight_class")
+
+def booking_dict(booking, **changes) -> dict:
+    data = {f: getattr(booking, f) for f in BOOKING_FIELDS}
+    data.update(changes)
+    return data
+
+def cache_booking(data: dict):
+    """
+    Write-through after commit, so lookups never serve a copy from before the write. The
+    commit has already happened, so a cache error is logged rather than failing the request
+    (which would release its idempotency key and let a retry write twice).
+    """
+    try:
+        cache.booking_cache.set(data["booking_reference"], data)
+    except Exception:
+        logger.warning("booking cache write failed for %s", data["booking_reference"], exc_info=True)
+
+def add_booking(db: Session, booking: schemas.BookingCreate) -> models.Booking:
+    """Hold a seat and stage a new CONFIRMED booking in the session, flushed (caller commits)."""
     booking_ref = generate_booking_reference()
+    flight_class = booking.flight_class or inventory.DEFAULT_CLASS
+    flight_id = inventory.allocate_seats(db, booking.origin, booking.destination, booking.date, booking.time, flight_class)
 
     db_booking = models.Booking(
         passenger_name=booking.passenger_name,
@@ -26,39 +79,427 @@ def book_flight(booking: schemas.BookingCreate, db: Session = Depends(get_db_ses
         date=booking.date,
         time=booking.time,
         status="CONFIRMED",
-        booking_reference=booking_ref
+        booking_reference=booking_ref,
+        flight_class=flight_class,
+        flight_id=flight_id,
     )
     db.add(db_booking)
-    db.commit()
-    db.refresh(db_booking)
+    db.flush()
     return db_booking
 
-# ----------------- CANCEL -----------------
-@router.post("/cancel-flight", response_model=schemas.BookingResponse)
-def cancel_flight(cancel_req: schemas.CancelRequest, db: Session = Depends(get_db_session)):
-    booking = db.query(models.Booking).filter_by(booking_reference=cancel_req.booking_reference).first()
-    if not booking:
+# ----------------- BOOK -----------------
+@router.post("/book-flight", response_model=schemas.BookingResponse)
+def book_flight(booking: schemas.BookingCreate, idempotency_key: Optional[str] = Header(None),
+                db: Session = Depends(get_db_session)):
+    def handler():
+        if group_commit.GROUP_COMMIT:
+            # a failed job only rolls back its own savepoint, so it can simply be resubmitted
+            db_booking = retry_reference_collisions(
+                lambda: group_commit.get_writer().submit(lambda session: add_booking(session, booking)))
+        else:
+            def attempt():
+                db_booking = add_booking(db, booking)
+                db.commit()
+                return db_booking
+            db_booking = retry_reference_collisions(attempt, db.rollback)
+            db.refresh(db_booking)
+        data = booking_dict(db_booking)
+        cache_booking(data)
+        return data
+    return idempotency.run(idempotency_key, "book-flight", booking, handler)
+
+# ----------------- CONDITIONAL UPDATE -----------------
+def _raise_update_failure(db: Session, booking_reference: str, cancelled_detail: str):
+    """The guarded UPDATE matched nothing; one cheap SELECT tells the caller why."""
+    row = db.execute(
+        select(models.Booking.status, models.Booking.version)
+        .where(models.Booking.booking_reference == booking_reference)
+    ).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Booking not found")
-    if booking.status == "CANCELLED":
-        raise HTTPException(status_code=400, detail="Booking already cancelled")
-    
-    booking.status = "CANCELLED"
-    db.commit()
-    db.refresh(booking)
+    if row.status == "CANCELLED":
+        raise HTTPException(status_code=400, detail=cancelled_detail)
+    raise HTTPException(status_code=409, detail=f"Booking was modified concurrently (current version {row.version})")
+
+def update_booking(db: Session, booking_reference: str, expected_version: Optional[int],
+                   cancelled_detail: str, **values) -> dict:
+    """
+    Apply `values` to a non-cancelled booking in a single UPDATE ... RETURNING round trip
+    (caller commits). The status guard and, when given, the expected version make the write
+    conditional, so concurrent writers can no longer silently overwrite each other.
+    The returned dict also carries the booking's flight_id for seat bookkeeping.
+    """
+    B = models.Booking
+    stmt = (
+        update(B)
+        .where(B.booking_reference == booking_reference, B.status != "CANCELLED")
+        .values(version=B.version + 1, **values)
+        .execution_options(synchronize_session=False)
+    )
+    if expected_version is not None:
+        stmt = stmt.where(B.version == expected_version)
+
+    columns = [getattr(B, f) for f in BOOKING_FIELDS + ("flight_id",)]
+    if db.get_bind().dialect.update_returning:
+        row = db.execute(stmt.returning(*columns)).mappings().first()
+    else:
+        # SQLite < 3.35: same guarded UPDATE, then read the row back
+        row = None
+        if db.execute(stmt).rowcount:
+            row = db.execute(select(*columns).where(B.booking_reference == booking_reference)).mappings().first()
+    if row is None:
+        _raise_update_failure(db, booking_reference, cancelled_detail)
+    return dict(row)
+
+def cancel_booking(db: Session, cancel_req: schemas.CancelRequest) -> dict:
+    booking = update_booking(db, cancel_req.booking_reference, cancel_req.expected_version,
+                             "Booking already cancelled", status="CANCELLED")
+    inventory.release_seat(db, booking.pop("flight_id"))
+    return booking
+
+def reschedule_booking(db: Session, reschedule_req: schemas.RescheduleRequest) -> dict:
+    """Move the booking, and its seat, to the new departure in the same transaction."""
+    booking = update_booking(db, reschedule_req.booking_reference, reschedule_req.expected_version,
+                             "Cannot reschedule a cancelled booking",
+                             date=reschedule_req.new_date, time=reschedule_req.new_time, status="RESCHEDULED")
+    old_flight_id = booking.pop("flight_id")
+    departure = (booking["origin"], booking["destination"], reschedule_req.new_date, reschedule_req.new_time,
+                 booking["flight_class"])
+    if old_flight_id is not None and inventory.flight_id_for(db, *departure) == old_flight_id:
+        return booking  # same departure: keep the seat already held
+
+    new_flight_id = inventory.allocate_seats(db, *departure)
+    inventory.release_seat(db, old_flight_id)
+    if new_flight_id != old_flight_id:
+        db.execute(
+            update(models.Booking)
+            .where(models.Booking.booking_reference == reschedule_req.booking_reference)
+            .values(flight_id=new_flight_id)
+            .execution_options(synchronize_session=False)
+        )
     return booking
 
+# ----------------- CANCEL -----------------
+@router.post("/cancel-flight", response_model=schemas.BookingResponse)
+def cancel_flight(cancel_req: schemas.CancelRequest, idempotency_key: Optional[str] = Header(None),
+                  db: Session = Depends(get_db_session)):
+    def handler():
+        booking = cancel_booking(db, cancel_req)
+        db.commit()
+        cache_booking(booking)
+        return booking
+    return idempotency.run(idempotency_key, "cancel-flight", cancel_req, handler)
+
 # ----------------- RESCHEDULE -----------------
 @router.post("/reschedule-flight", response_model=schemas.BookingResponse)
-def reschedule_flight(reschedule_req: schemas.RescheduleRequest, db: Session = Depends(get_db_session)):
-    booking = db.query(models.Booking).filter_by(booking_reference=reschedule_req.booking_reference).first()
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    if booking.status == "CANCELLED":
-        raise HTTPException(status_code=400, detail="Cannot reschedule a cancelled booking")
-    
-    booking.date = reschedule_req.new_date
-    booking.time = reschedule_req.new_time
-    booking.status = "RESCHEDULED"
-    db.commit()
-    db.refresh(booking)
-    return booking
+def reschedule_flight(reschedule_req: schemas.RescheduleRequest, idempotency_key: Optional[str] = Header(None),
+                      db: Session = Depends(get_db_session)):
+    def handler():
+        booking = reschedule_booking(db, reschedule_req)
+        db.commit()
+        cache_booking(booking)
+        return booking
+    return idempotency.run(idempotency_key, "reschedule-flight", reschedule_req, handler)
+
+# ----------------- LOOKUP -----------------
+def get_booking_by_reference(db: Session, booking_reference: str) -> dict:
+    """
+    Read-through: serve from booking_cache, fall back to the unique index on a miss. The
+    fill is set-if-absent, so a row read before a concurrent write-through cannot replace
+    the newer copy; only the write paths (cache_booking) overwrite.
+    """
+    data = cache.booking_cache.get(booking_reference)
+    if data is None:
+        booking = db.query(models.Booking).filter_by(booking_reference=booking_reference).first()
+        if not booking:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        data = booking_dict(booking)
+        cache.booking_cache.add(booking_reference, data)
+    return data
+
+@router.get("/bookings/{booking_reference}", response_model=schemas.BookingResponse)
+def get_booking(booking_reference: str, db: Session = Depends(get_db_session)):
+    return get_booking_by_reference(db, booking_reference)
+
+@router.get("/cache/stats")
+def cache_stats():
+    return cache.booking_cache.stats()
+
+# ----------------- BULK -----------------
+def booking_dict_from_row(row: dict) -> dict:
+    return {f: row[f] for f in BOOKING_FIELDS}
+
+def _bulk_response(results: List[schemas.BulkItemResult]) -> schemas.BulkResponse:
+    succeeded = sum(1 for r in results if r.ok)
+    return schemas.BulkResponse(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+def cache_bulk_results(response: schemas.BulkResponse):
+    for result in response.results:
+        if result.ok:
+            cache_booking(booking_dict(result.booking))
+
+def check_bulk_size(items: list):
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ITEMS} items per bulk request")
+
+def _load_bookings(db: Session, refs) -> dict:
+    """
+    booking_reference -> Booking for every existing ref, in one SELECT ... IN ... FOR UPDATE.
+    The row locks hold the versions read until the caller commits (SQLite has no row locks
+    and serialises writers instead).
+    """
+    stmt = select(models.Booking).where(models.Booking.booking_reference.in_(set(refs))).with_for_update()
+    rows = db.execute(stmt).scalars()
+    return {b.booking_reference: b for b in rows}
+
+def bulk_add_bookings(db: Session, bookings: List[schemas.BookingCreate]) -> schemas.BulkResponse:
+    """
+    Hold seats with one decrement per distinct departure, then insert all bookings with one
+    executemany INSERT (caller commits). Seats are all-or-nothing per departure: if a
+    departure cannot seat every item in the batch, those items fail and the rest go through.
+    """
+    by_departure = defaultdict(list)
+    for i, b in enumerate(bookings):
+        by_departure[(b.origin, b.destination, b.date, b.time, b.flight_class or inventory.DEFAULT_CLASS)].append(i)
+    flight_ids, errors = {}, {}
+    for departure, indexes in by_departure.items():
+        try:
+            flight_id = inventory.allocate_seats(db, *departure, seats=len(indexes))
+        except HTTPException as e:
+            errors.update((i, e.detail) for i in indexes)
+            continue
+        flight_ids.update((i, flight_id) for i in indexes)
+
+    rows = {
+        i: {
+            "passenger_name": b.passenger_name,
+            "origin": b.origin,
+            "destination": b.destination,
+            "date": b.date,
+            "time": b.time,
+            "status": "CONFIRMED",
+            "booking_reference": generate_booking_reference(),
+            "version": 1,
+            "flight_class": b.flight_class or inventory.DEFAULT_CLASS,
+            "flight_id": flight_ids[i],
+        }
+        for i, b in enumerate(bookings) if i not in errors
+    }
+    if rows:
+        db.execute(insert(models.Booking), list(rows.values()))
+    results = [
+        schemas.BulkItemResult(index=i, ok=True, booking=schemas.BookingResponse(**booking_dict_from_row(rows[i])))
+        if i in rows else schemas.BulkItemResult(index=i, ok=False, error=errors[i])
+        for i in range(len(bookings))
+    ]
+    return _bulk_response(results)
+
+def _item_conflict(booking, req) -> Optional[str]:
+    if req.expected_version is not None and booking.version != req.expected_version:
+        return f"Booking was modified concurrently (current version {booking.version})"
+    return None
+
+def _raise_bulk_conflict():
+    raise HTTPException(status_code=409, detail="Bookings were modified concurrently; retry the batch")
+
+def bulk_cancel_bookings(db: Session, cancel_reqs: List[schemas.CancelRequest]) -> schemas.BulkResponse:
+    """
+    Cancel every cancellable booking with one set-based UPDATE ... WHERE (ref, version) IN
+    (caller commits). Matching on the versions just read means a row changed in between
+    is not overwritten; the whole batch then fails with 409 and can be retried.
+    """
+    existing = _load_bookings(db, [r.booking_reference for r in cancel_reqs])
+    results, to_cancel = [], {}
+    for i, req in enumerate(cancel_reqs):
+        ref = req.booking_reference
+        booking = existing.get(ref)
+        if not booking:
+            results.append(schemas.BulkItemResult(index=i, ok=False, error="Booking not found"))
+        elif booking.status == "CANCELLED" or ref in to_cancel:
+            results.append(schemas.BulkItemResult(index=i, ok=False, error="Booking already cancelled"))
+        elif _item_conflict(booking, req):
+            results.append(schemas.BulkItemResult(index=i, ok=False, error=_item_conflict(booking, req)))
+        else:
+            to_cancel[ref] = booking.version
+            changed = booking_dict(booking, status="CANCELLED", version=booking.version + 1)
+            results.append(schemas.BulkItemResult(index=i, ok=True, booking=schemas.BookingResponse(**changed)))
+
+    if to_cancel:
+        B = models.Booking
+        updated = db.execute(
+            update(B)
+            .where(tuple_(B.booking_reference, B.version).in_(list(to_cancel.items())))
+            .values(status="CANCELLED", version=B.version + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if updated != len(to_cancel):
+            _raise_bulk_conflict()
+        inventory.release_seats(db, Counter(existing[ref].flight_id for ref in to_cancel))
+    return _bulk_response(results)
+
+def _move_seats(db: Session, candidates: dict, errors: dict) -> dict:
+    """
+    Seat moves for a bulk reschedule: one decrement per distinct new departure for the
+    bookings that actually change flight. Returns index -> new flight_id; items whose
+    departure cannot take them all get an entry in `errors` instead.
+    """
+    by_departure = defaultdict(list)
+    for i, (req, booking) in candidates.items():
+        by_departure[(booking.origin, booking.destination, req.new_date, req.new_time, booking.flight_class)].append(i)
+    new_flight_ids = {}
+    for departure, indexes in by_departure.items():
+        target_id = inventory.flight_id_for(db, *departure)
+        movers = [i for i in indexes if target_id is None or candidates[i][1].flight_id != target_id]
+        new_flight_ids.update((i, target_id) for i in indexes if i not in movers)
+        if not movers:
+            continue
+        try:
+            flight_id = inventory.allocate_seats(db, *departure, seats=len(movers))
+        except HTTPException as e:
+            errors.update((i, e.detail) for i in movers)
+            continue
+        new_flight_ids.update((i, flight_id) for i in movers)
+    return new_flight_ids
+
+def bulk_reschedule_bookings(db: Session, reschedule_reqs: List[schemas.RescheduleRequest]) -> schemas.BulkResponse:
+    """
+    Reschedule bookings with one executemany UPDATE keyed by (reference, version read)
+    (caller commits). A row changed in between is never overwritten: the whole batch fails
+    with 409 before any seat is released, and the seats it took roll back with it.
+    """
+    existing = _load_bookings(db, [r.booking_reference for r in reschedule_reqs])
+    candidates, errors, seen = {}, {}, set()
+    for i, req in enumerate(reschedule_reqs):
+        booking = existing.get(req.booking_reference)
+        if not booking:
+            errors[i] = "Booking not found"
+        elif booking.status == "CANCELLED":
+            errors[i] = "Cannot reschedule a cancelled booking"
+        elif req.booking_reference in seen:
+            errors[i] = "Booking appears more than once in this batch"
+        elif _item_conflict(booking, req):
+            errors[i] = _item_conflict(booking, req)
+        else:
+            candidates[i] = (req, booking)
+        seen.add(req.booking_reference)
+
+    new_flight_ids = _move_seats(db, candidates, errors)
+    params, released, results = [], Counter(), []
+    for i in range(len(reschedule_reqs)):
+        if i in errors:
+            results.append(schemas.BulkItemResult(index=i, ok=False, error=errors[i]))
+            continue
+        req, booking = candidates[i]
+        if new_flight_ids[i] != booking.flight_id:
+            released[booking.flight_id] += 1
+        params.append({
+            "ref": req.booking_reference, "read_version": booking.version,
+            "new_date": req.new_date, "new_time": req.new_time, "new_flight_id": new_flight_ids[i],
+        })
+        changed = booking_dict(booking, date=req.new_date, time=req.new_time, status="RESCHEDULED",
+                               version=booking.version + 1)
+        results.append(schemas.BulkItemResult(index=i, ok=True, booking=schemas.BookingResponse(**changed)))
+
+    if params:
+        table = models.Booking.__table__
+        stmt = (
+            update(table)
+            .where(table.c.booking_reference == bindparam("ref"), table.c.version == bindparam("read_version"))
+            .values(date=bindparam("new_date"), time=bindparam("new_time"), status="RESCHEDULED",
+                    flight_id=bindparam("new_flight_id"), version=table.c.version + 1)
+        )
+        if _update_each(db, stmt, params) != len(params):
+            _raise_bulk_conflict()
+        inventory.release_seats(db, released)
+    return _bulk_response(results)
+
+def _update_each(db: Session, stmt, params: list) -> int:
+    """
+    Rows matched by an executemany UPDATE. Drivers without executemany row counts
+    (asyncpg, psycopg2's fast executemany) get one statement per item instead, so
+    every item's WHERE is still checked.
+    """
+    if db.get_bind().dialect.supports_sane_multi_rowcount:
+        return db.execute(stmt, params).rowcount
+    return sum(db.execute(stmt, item).rowcount for item in params)
+
+@router.post("/bulk/book-flight", response_model=schemas.BulkResponse)
+def bulk_book_flight(bookings: List[schemas.BookingCreate], idempotency_key: Optional[str] = Header(None),
+                     db: Session = Depends(get_db_session)):
+    check_bulk_size(bookings)
+    def attempt():
+        response = bulk_add_bookings(db, bookings)
+        db.commit()
+        return response
+    def handler():
+        response = retry_reference_collisions(attempt, db.rollback)
+        cache_bulk_results(response)
+        return response
+    return idempotency.run(idempotency_key, "bulk/book-flight", bookings, handler)
+
+@router.post("/bulk/cancel-flight", response_model=schemas.BulkResponse)
+def bulk_cancel_flight(cancel_reqs: List[schemas.CancelRequest], idempotency_key: Optional[str] = Header(None),
+                       db: Session = Depends(get_db_session)):
+    check_bulk_size(cancel_reqs)
+    def handler():
+        response = bulk_cancel_bookings(db, cancel_reqs)
+        db.commit()
+        cache_bulk_results(response)
+        return response
+    return idempotency.run(idempotency_key, "bulk/cancel-flight", cancel_reqs, handler)
+
+@router.post("/bulk/reschedule-flight", response_model=schemas.BulkResponse)
+def bulk_reschedule_flight(reschedule_reqs: List[schemas.RescheduleRequest], idempotency_key: Optional[str] = Header(None),
+                           db: Session = Depends(get_db_session)):
+    check_bulk_size(reschedule_reqs)
+    def handler():
+        response = bulk_reschedule_bookings(db, reschedule_reqs)
+        db.commit()
+        cache_bulk_results(response)
+        return response
+    return idempotency.run(idempotency_key, "bulk/reschedule-flight", reschedule_reqs, handler)
+
+# ----------------- SEARCH -----------------
+def encode_cursor(booking_date: date, booking_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{booking_date.isoformat()}|{booking_id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        raw_date, raw_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return date.fromisoformat(raw_date), int(raw_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def search_bookings(db: Session, filters: schemas.BookingSearch) -> schemas.BookingPage:
+    """
+    Keyset (seek) pagination ordered by (date, id): each page starts right after the
+    previous page's last row instead of skipping OFFSET rows, so page N costs the same as page 1.
+    """
+    B = models.Booking
+    stmt = select(B)
+    for column, value in ((B.passenger_name, filters.passenger_name), (B.origin, filters.origin),
+                          (B.destination, filters.destination), (B.status, filters.status)):
+        if value is not None:
+            stmt = stmt.where(column == value)
+    if filters.date_from is not None:
+        stmt = stmt.where(B.date >= filters.date_from)
+    if filters.date_to is not None:
+        stmt = stmt.where(B.date <= filters.date_to)
+    if filters.cursor:
+        after_date, after_id = decode_cursor(filters.cursor)
+        stmt = stmt.where(tuple_(B.date, B.id) > tuple_(after_date, after_id))
+
+    # one extra row tells us whether a next page exists without a COUNT
+    rows = db.execute(stmt.order_by(B.date, B.id).limit(filters.limit + 1)).scalars().all()
+    page = rows[:filters.limit]
+    next_cursor: Optional[str] = None
+    if len(rows) > filters.limit:
+        next_cursor = encode_cursor(page[-1].date, page[-1].id)
+    return schemas.BookingPage(
+        items=[schemas.BookingResponse(**booking_dict(b)) for b in page],
+        next_cursor=next_cursor,
+    )
+
+@router.get("/bookings", response_model=schemas.BookingPage)
+def list_bookings(filters: Annotated[schemas.BookingSearch, Query()], db: Session = Depends(get_db_session)):
+    return search_bookings(db, filters)
@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, Header, Query
+from typing import Annotated, List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import schemas, db, group_commit, cache, idempotency
+from . import bookings as sync_bookings
+
+# Same endpoints as bookings.py, served from the asyncio engine (USE_ASYNC_DB=true)
+# so a worker is not pinned to a thread for the whole DB round trip.
+router = APIRouter()
+
+# Dependency
+get_db_session = db.get_async_db
+
+async def retry_reference_collisions(attempt, rollback=None):
+    """Async counterpart of bookings.retry_reference_collisions."""
+    for n in range(sync_bookings.REF_COLLISION_RETRIES + 1):
+        try:
+            return await attempt()
+        except IntegrityError as e:
+            if n == sync_bookings.REF_COLLISION_RETRIES or not sync_bookings.is_reference_collision(e):
+                raise
+            if rollback is not None:
+                await rollback()
+
+# ----------------- BOOK -----------------
+@router.post("/book-flight", response_model=schemas.BookingResponse)
+async def book_flight(booking: schemas.BookingCreate, idempotency_key: Optional[str] = Header(None),
+                      db: AsyncSession = Depends(get_db_session)):
+    async def attempt():
+        if group_commit.GROUP_COMMIT:
+            return await group_commit.get_writer().submit_async(lambda session: sync_bookings.add_booking(session, booking))
+        # run the shared sync helper on the async session's connection (no thread hop)
+        db_booking = await db.run_sync(lambda session: sync_bookings.add_booking(session, booking))
+        await db.commit()
+        return db_booking
+
+    async def handler():
+        db_booking = await retry_reference_collisions(attempt, None if group_commit.GROUP_COMMIT else db.rollback)
+        # expire_on_commit=False keeps the response fields loaded, no refresh round trip
+        data = sync_bookings.booking_dict(db_booking)
+        sync_bookings.cache_booking(data)
+        return data
+    return await idempotency.run_async(idempotency_key, "book-flight", booking, handler)
+
+# ----------------- CANCEL -----------------
+@router.post("/cancel-flight", response_model=schemas.BookingResponse)
+async def cancel_flight(cancel_req: schemas.CancelRequest, idempotency_key: Optional[str] = Header(None),
+                        db: AsyncSession = Depends(get_db_session)):
+    async def handler():
+        booking = await db.run_sync(lambda session: sync_bookings.cancel_booking(session, cancel_req))
+        await db.commit()
+        sync_bookings.cache_booking(booking)
+        return booking
+    return await idempotency.run_async(idempotency_key, "cancel-flight", cancel_req, handler)
+
+# ----------------- RESCHEDULE -----------------
+@router.post("/reschedule-flight", response_model=schemas.BookingResponse)
+async def reschedule_flight(reschedule_req: schemas.RescheduleRequest, idempotency_key: Optional[str] = Header(None),
+                            db: AsyncSession = Depends(get_db_session)):
+    async def handler():
+        booking = await db.run_sync(lambda session: sync_bookings.reschedule_booking(session, reschedule_req))
+        await db.commit()
+        sync_bookings.cache_booking(booking)
+        return booking
+    return await idempotency.run_async(idempotency_key, "reschedule-flight", reschedule_req, handler)
+
+# ----------------- LOOKUP -----------------
+@router.get("/bookings/{booking_reference}", response_model=schemas.BookingResponse)
+async def get_booking(booking_reference: str, db: AsyncSession = Depends(get_db_session)):
+    # a cache hit never checks out a connection: the session only connects on a miss
+    return await db.run_sync(lambda session: sync_bookings.get_booking_by_reference(session, booking_reference))
+
+@router.get("/cache/stats")
+async def cache_stats():
+    return cache.booking_cache.stats()
+
+# ----------------- BULK -----------------
+async def _run_bulk(db: AsyncSession, idempotency_key: Optional[str], scope: str, items: list, bulk_fn):
+    sync_bookings.check_bulk_size(items)
+    async def attempt():
+        response = await db.run_sync(lambda session: bulk_fn(session, items))
+        await db.commit()
+        return response
+    async def handler():
+        # only inserts can collide, but a retry is harmless (and never triggered) for the updates
+        response = await retry_reference_collisions(attempt, db.rollback)
+        sync_bookings.cache_bulk_results(response)
+        return response
+    return await idempotency.run_async(idempotency_key, scope, items, handler)
+
+@router.post("/bulk/book-flight", response_model=schemas.BulkResponse)
+async def bulk_book_flight(bookings: List[schemas.BookingCreate], idempotency_key: Optional[str] = Header(None),
+                           db: AsyncSession = Depends(get_db_session)):
+    return await _run_bulk(db, idempotency_key, "bulk/book-flight", bookings, sync_bookings.bulk_add_bookings)
+
+@router.post("/bulk/cancel-flight", response_model=schemas.BulkResponse)
+async def bulk_cancel_flight(cancel_reqs: List[schemas.CancelRequest], idempotency_key: Optional[str] = Header(None),
+                             db: AsyncSession = Depends(get_db_session)):
+    return await _run_bulk(db, idempotency_key, "bulk/cancel-flight", cancel_reqs, sync_bookings.bulk_cancel_bookings)
+
+@router.post("/bulk/reschedule-flight", response_model=schemas.BulkResponse)
+async def bulk_reschedule_flight(reschedule_reqs: List[schemas.RescheduleRequest], idempotency_key: Optional[str] = Header(None),
+                                 db: AsyncSession = Depends(get_db_session)):
+    return await _run_bulk(db, idempotency_key, "bulk/reschedule-flight", reschedule_reqs,
+                           sync_bookings.bulk_reschedule_bookings)
+
+# ----------------- SEARCH -----------------
+@router.get("/bookings", response_model=schemas.BookingPage)
+async def list_bookings(filters: Annotated[schemas.BookingSearch, Query()], db: AsyncSession = Depends(get_db_session)):
+    return await db.run_sync(lambda session: sync_bookings.search_bookings(session, filters))
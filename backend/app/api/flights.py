@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+from .. import schemas, db, inventory
+
+# Flight inventory admin: low-traffic, so one sync router serves both DB modes
+router = APIRouter()
+
+# Dependency
+get_db_session = db.get_db
+
+@router.post("/flights", response_model=schemas.FlightResponse)
+def create_flight(flight: schemas.FlightCreate, db: Session = Depends(get_db_session)):
+    db_flight = inventory.create_flight(db, flight)
+    db.commit()
+    db.refresh(db_flight)
+    return db_flight
+
+@router.get("/flights", response_model=List[schemas.FlightResponse])
+def list_flights(origin: str, destination: str, date: Optional[date] = None, db: Session = Depends(get_db_session)):
+    return inventory.find_flights(db, origin, destination, date)
@@ -0,0 +1,209 @@
+# backend/app/cache.py
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Read-through cache for GET /bookings/{booking_reference}
+BOOKING_CACHE_ENABLED = os.getenv("BOOKING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+BOOKING_CACHE_SIZE = int(os.getenv("BOOKING_CACHE_SIZE", "10000"))
+BOOKING_CACHE_TTL = float(os.getenv("BOOKING_CACHE_TTL", "60"))  # seconds
+# optional shared tier (e.g. redis://localhost:6379/0) so workers see each other's writes
+BOOKING_CACHE_URL = os.getenv("BOOKING_CACHE_URL", "")
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    """Thread-safe in-process LRU cache whose entries also expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is not _MISSING:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def _store(self, key: str, value: Any, ttl: Optional[float]):
+        # caller holds self._lock
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set only if the key is absent or expired; True if this call stored the value."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > time.monotonic():
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class RedisCache:
+    """Shared cache tier; values are stored as JSON with a server-side TTL."""
+
+    def __init__(self, url: str, ttl: float = 60.0, prefix: str = "booking:"):
+        import redis  # optional dependency, only needed when BOOKING_CACHE_URL is set
+
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl_ms = int((self.ttl if ttl is None else ttl) * 1000)
+        self._client.set(self.prefix + key, json.dumps(value, default=str), px=ttl_ms)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        ttl_ms = int((self.ttl if ttl is None else ttl) * 1000)
+        return bool(self._client.set(self.prefix + key, json.dumps(value, default=str), px=ttl_ms, nx=True))
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self._client.scan_iter(self.prefix + "*"):
+            self._client.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class TieredCache:
+    """
+    Local LRU in front of an optional shared tier. Writes go to both tiers; other
+    workers' local copies of an entry can lag a write by at most the local TTL.
+    """
+
+    def __init__(self, local: LRUTTLCache, shared: Optional[RedisCache] = None):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if self.shared is not None:
+            value = self.shared.get(key, _MISSING)
+            if value is not _MISSING:
+                self.local.set(key, value)
+                return value
+        return default
+
+    def set(self, key: str, value: Any):
+        self.local.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+    def add(self, key: str, value: Any) -> bool:
+        """
+        Set only if the key is absent; True if this call stored the value. The shared tier
+        decides, so a read-through fill never replaces another worker's newer write.
+        """
+        if self.shared is None:
+            return self.local.add(key, value)
+        if not self.shared.add(key, value):
+            return False
+        self.local.set(key, value)
+        return True
+
+    def delete(self, key: str):
+        self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete(key)
+
+    def clear(self):
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        out = {"enabled": True, "local": self.local.stats()}
+        if self.shared is not None:
+            out["shared"] = self.shared.stats()
+        return out
+
+
+class NullCache:
+    """Used when BOOKING_CACHE_ENABLED is off: every lookup goes to the database."""
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return default
+
+    def set(self, key: str, value: Any):
+        pass
+
+    def add(self, key: str, value: Any) -> bool:
+        return False
+
+    def delete(self, key: str):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+
+def build_booking_cache():
+    if not BOOKING_CACHE_ENABLED:
+        return NullCache()
+    shared = RedisCache(BOOKING_CACHE_URL, ttl=BOOKING_CACHE_TTL) if BOOKING_CACHE_URL else None
+    return TieredCache(LRUTTLCache(BOOKING_CACHE_SIZE, BOOKING_CACHE_TTL), shared)
+
+# booking_reference -> booking response dict
+booking_cache = build_booking_cache()
@@ -1,21 +1,109 @@
 # backend/app/db.py
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from . import sql_profiler
+
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
 if not SQLALCHEMY_DATABASE_URL:
     SQLALCHEMY_DATABASE_URL = "sqlite:///./dev.db"
-    
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=True)
+
+# Serve the bookings router from an asyncio engine instead of the threadpool
+USE_ASYNC_DB = os.getenv("USE_ASYNC_DB", "false").lower() in ("1", "true", "yes")
+
+# "production" sizes the pool and tunes SQLite for concurrent writers
+DB_PROFILE = os.getenv("DB_PROFILE", "dev").lower()
+PRODUCTION = DB_PROFILE in ("prod", "production")
+
+# log every statement (SQLAlchemy echo); slow-query hunting is better served by SQL_PROFILE
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# applied to every new SQLite connection in the production profile
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",      # readers stop blocking the writer
+    "synchronous": "NORMAL",    # fsync at checkpoints instead of every commit (safe under WAL)
+    "cache_size": -64000,       # 64 MiB page cache (negative means KiB)
+    "mmap_size": 268435456,     # 256 MiB of memory-mapped reads
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,       # wait up to 5 s for the write lock instead of failing
+}
+
+# sync driver prefix -> asyncio driver prefix
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+def _to_async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(SQLALCHEMY_DATABASE_URL)
+
+def is_sqlite_url(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _is_sqlite_memory(url: str) -> bool:
+    path = url.partition("://")[2]
+    return path in ("", "/", "/:memory:") or "mode=memory" in path
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+def engine_options(url: str) -> dict:
+    """Keyword arguments for create_engine/create_async_engine under the active DB_PROFILE."""
+    options = {"echo": SQL_ECHO}
+    if not PRODUCTION:
+        return options
+    # in-memory SQLite uses a single-connection pool that takes no sizing arguments
+    if not (is_sqlite_url(url) and _is_sqlite_memory(url)):
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    return options
+
+def configure_engine(sync_engine, url: str):
+    """Attach the production connect hooks (SQLite pragmas) and, with SQL_PROFILE, the statement profiler."""
+    if PRODUCTION and is_sqlite_url(url):
+        event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+    if sql_profiler.profiler is not None:
+        sql_profiler.profiler.attach(sync_engine)
+    return sync_engine
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, **overrides):
+    return configure_engine(create_engine(url, **{**engine_options(url), **overrides}), url)
+
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# only build the async engine when asked, so aiosqlite/asyncpg stay optional
+async_engine = None
+AsyncSessionLocal = None
+if USE_ASYNC_DB:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+    configure_engine(async_engine.sync_engine, ASYNC_DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
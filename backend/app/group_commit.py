@@ -0,0 +1,135 @@
+# backend/app/group_commit.py
+import os
+import queue
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from . import db
+
+# Batch concurrent book-flight inserts into one transaction (one fsync per batch)
+GROUP_COMMIT = os.getenv("GROUP_COMMIT", "false").lower() in ("1", "true", "yes")
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("GROUP_COMMIT_MAX_BATCH", "64"))
+# extra time the writer waits for a batch to fill; 0 = take whatever queued up during the last commit
+GROUP_COMMIT_MAX_DELAY_MS = float(os.getenv("GROUP_COMMIT_MAX_DELAY_MS", "0"))
+
+Job = Callable[[Session], Any]
+
+
+def _writer_engine(url: str):
+    engine = db.create_db_engine(url)
+    if db.is_sqlite_url(url):
+        # pysqlite opens and closes transactions on its own, which breaks SAVEPOINT;
+        # take over transaction control so each job's savepoint nests in the batch.
+        @event.listens_for(engine, "connect")
+        def _driver_autocommit(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _begin_immediate(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    return engine
+
+
+class GroupCommitWriter:
+    """
+    Single background writer thread that runs queued write jobs in one transaction.
+    Every job runs inside its own SAVEPOINT, so a failing job only rolls back itself
+    and gets its exception back, while the rest of the batch shares one COMMIT.
+    """
+
+    def __init__(self, session_factory, max_batch: int = GROUP_COMMIT_MAX_BATCH,
+                 max_delay_ms: float = GROUP_COMMIT_MAX_DELAY_MS):
+        self._session_factory = session_factory
+        self._max_batch = max(1, max_batch)
+        self._max_delay = max_delay_ms / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.jobs = 0
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, job: Job) -> Future:
+        fut: Future = Future()
+        self._ensure_started()
+        self._queue.put((job, fut))
+        return fut
+
+    def submit(self, job: Job) -> Any:
+        """Run job(session) in the next batch and block until that batch has committed."""
+        return self.enqueue(job).result()
+
+    async def submit_async(self, job: Job) -> Any:
+        return await asyncio.wrap_future(self.enqueue(job))
+
+    def _next_batch(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._max_delay
+        while len(batch) < self._max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            self._commit_batch(self._next_batch())
+
+    def _commit_batch(self, batch: list):
+        outcomes = []
+        session = self._session_factory()
+        try:
+            for job, fut in batch:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with session.begin_nested():
+                        outcomes.append((fut, job(session), None))
+                except Exception as e:
+                    outcomes.append((fut, None, e))
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            for fut, _, _ in outcomes:
+                fut.set_exception(e)
+            return
+        finally:
+            session.close()
+
+        self.batches += 1
+        self.jobs += len(outcomes)
+        for fut, result, error in outcomes:
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_writer() -> GroupCommitWriter:
+    """Process-wide writer bound to DATABASE_URL (needs a file or server database, not :memory:)."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                factory = sessionmaker(bind=_writer_engine(db.SQLALCHEMY_DATABASE_URL),
+                                       autoflush=False, expire_on_commit=False)
+                _writer = GroupCommitWriter(factory)
+    return _writer
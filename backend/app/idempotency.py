@@ -0,0 +1,94 @@
+# backend/app/idempotency.py
+import os
+import json
+import hashlib
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+
+from .cache import LRUTTLCache, RedisCache
+
+# Dedup store for the Idempotency-Key header on mutating endpoints
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", "86400"))  # keep completed responses for 24 h
+# how long a key stays "in progress" if its request dies without finishing (longer than any request)
+IDEMPOTENCY_PENDING_TTL = float(os.getenv("IDEMPOTENCY_PENDING_TTL", "60"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "100000"))
+# share keys across workers; without it a retry must land on the same worker to be deduplicated
+IDEMPOTENCY_CACHE_URL = os.getenv("IDEMPOTENCY_CACHE_URL", os.getenv("BOOKING_CACHE_URL", ""))
+
+
+def _build_store():
+    # one tier only: a local copy of a "pending" marker would outlive the request on other workers
+    if IDEMPOTENCY_CACHE_URL:
+        return RedisCache(IDEMPOTENCY_CACHE_URL, ttl=IDEMPOTENCY_TTL, prefix="idem:")
+    return LRUTTLCache(IDEMPOTENCY_MAX_KEYS, IDEMPOTENCY_TTL)
+
+# "<scope>:<key>" -> {"fp": request fingerprint, "state": "pending"|"done", "response": ...}
+store = _build_store()
+
+
+def fingerprint(body: Any) -> str:
+    """16-byte digest of the canonical request body; stored instead of the body itself."""
+    canonical = json.dumps(jsonable_encoder(body), sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def _begin(key: str, scope: str, body: Any):
+    """
+    Claim the key for this request. Returns (store_key, fingerprint, replay), where replay
+    is the stored response of an earlier identical request, or None if this request runs.
+    """
+    store_key = f"{scope}:{key}"
+    fp = fingerprint(body)
+    if store.add(store_key, {"fp": fp, "state": "pending"}, ttl=IDEMPOTENCY_PENDING_TTL):
+        return store_key, fp, None
+    entry = store.get(store_key)
+    if entry is None:  # expired between add() and get(); let the caller retry
+        raise HTTPException(status_code=409, detail="Idempotency-Key is being processed, retry shortly",
+                            headers={"Retry-After": "1"})
+    if entry["fp"] != fp:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+    if entry["state"] != "done":
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress",
+                            headers={"Retry-After": "1"})
+    return store_key, fp, entry["response"]
+
+
+def _complete(store_key: str, fp: str, response: Any) -> Any:
+    encoded = jsonable_encoder(response)
+    store.set(store_key, {"fp": fp, "state": "done", "response": encoded}, ttl=IDEMPOTENCY_TTL)
+    return response
+
+
+def run(key: Optional[str], scope: str, body: Any, handler: Callable[[], Any]) -> Any:
+    """
+    Run handler() at most once per (scope, key). A replay with the same key and body gets
+    the stored response without touching the database; failed requests release the key so
+    the client's retry runs for real. Without a key the handler simply runs.
+    """
+    if not key:
+        return handler()
+    store_key, fp, replay = _begin(key, scope, body)
+    if replay is not None:
+        return replay
+    try:
+        response = handler()
+    except BaseException:
+        store.delete(store_key)
+        raise
+    return _complete(store_key, fp, response)
+
+
+async def run_async(key: Optional[str], scope: str, body: Any, handler: Callable[[], Awaitable[Any]]) -> Any:
+    if not key:
+        return await handler()
+    store_key, fp, replay = _begin(key, scope, body)
+    if replay is not None:
+        return replay
+    try:
+        response = await handler()
+    except BaseException:
+        store.delete(store_key)
+        raise
+    return _complete(store_key, fp, response)
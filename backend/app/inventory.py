@@ -0,0 +1,101 @@
+# backend/app/inventory.py
+import os
+from collections import Counter
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.orm import Session
+
+from . import models
+
+# Reject bookings for departures missing from the flights table; otherwise they are
+# accepted without holding a seat (the behaviour before inventory existed).
+REQUIRE_FLIGHT_INVENTORY = os.getenv("REQUIRE_FLIGHT_INVENTORY", "false").lower() in ("1", "true", "yes")
+
+DEFAULT_CLASS = "Economy"
+
+
+def _departure(origin, destination, date, time, flight_class):
+    F = models.Flight
+    return (F.origin == origin, F.destination == destination, F.date == date,
+            F.time == time, F.flight_class == (flight_class or DEFAULT_CLASS))
+
+
+def flight_id_for(db: Session, origin, destination, date, time, flight_class) -> Optional[int]:
+    return db.execute(select(models.Flight.id).where(*_departure(origin, destination, date, time, flight_class))).scalar()
+
+
+def allocate_seats(db: Session, origin, destination, date, time, flight_class, seats: int = 1) -> Optional[int]:
+    """
+    Take `seats` seats on one departure/cabin with a single guarded decrement
+    (UPDATE ... SET seats_available = seats_available - n WHERE <departure> AND seats_available >= n).
+    Concurrent bookings for the same departure serialize on that row, so the counter never
+    goes negative and no COUNT(*) over bookings is needed. Returns the flight id, or None
+    when the departure is not inventoried and REQUIRE_FLIGHT_INVENTORY is off.
+    """
+    F = models.Flight
+    where = _departure(origin, destination, date, time, flight_class)
+    stmt = (
+        update(F)
+        .where(*where, F.seats_available >= seats)
+        .values(seats_available=F.seats_available - seats)
+        .execution_options(synchronize_session=False)
+    )
+    if db.get_bind().dialect.update_returning:
+        flight_id = db.execute(stmt.returning(F.id)).scalar()
+    else:
+        flight_id = None
+        if db.execute(stmt).rowcount:
+            flight_id = flight_id_for(db, origin, destination, date, time, flight_class)
+    if flight_id is not None:
+        return flight_id
+
+    if flight_id_for(db, origin, destination, date, time, flight_class) is not None:
+        raise HTTPException(status_code=409, detail="No seats available on this flight")
+    if REQUIRE_FLIGHT_INVENTORY:
+        raise HTTPException(status_code=404, detail="Flight not found")
+    return None
+
+
+def release_seats(db: Session, seats_by_flight: Dict[int, int]):
+    """Give seats back, one executemany UPDATE for all flights (flight_id -> seats)."""
+    seats_by_flight = {fid: n for fid, n in seats_by_flight.items() if fid is not None and n}
+    if not seats_by_flight:
+        return
+    table = models.Flight.__table__
+    db.execute(
+        update(table)
+        .where(table.c.id == bindparam("fid"))
+        .values(seats_available=table.c.seats_available + bindparam("n")),
+        [{"fid": fid, "n": n} for fid, n in seats_by_flight.items()],
+    )
+
+
+def release_seat(db: Session, flight_id: Optional[int]):
+    release_seats(db, Counter([flight_id]))
+
+
+def create_flight(db: Session, flight) -> models.Flight:
+    if flight_id_for(db, flight.origin, flight.destination, flight.date, flight.time, flight.flight_class) is not None:
+        raise HTTPException(status_code=409, detail="Flight already exists")
+    db_flight = models.Flight(
+        origin=flight.origin,
+        destination=flight.destination,
+        date=flight.date,
+        time=flight.time,
+        flight_class=flight.flight_class or DEFAULT_CLASS,
+        capacity=flight.capacity,
+        seats_available=flight.capacity,
+    )
+    db.add(db_flight)
+    db.flush()
+    return db_flight
+
+
+def find_flights(db: Session, origin: str, destination: str, date=None):
+    F = models.Flight
+    stmt = select(F).where(F.origin == origin, F.destination == destination)
+    if date is not None:
+        stmt = stmt.where(F.date == date)
+    return db.execute(stmt.order_by(F.date, F.time, F.flight_class)).scalars().all()
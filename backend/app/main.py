@@ -1,10 +1,25 @@
-# backend/app/main.py
 from fastapi import FastAPI
-from .api import bookings
-from .db import Base, engine
+from .api import bookings, bookings_async, flights, admin
+from .db import Base, engine, USE_ASYNC_DB
+from common import metrics
+from . import sql_profiler
 
 app = FastAPI(title="Flight Booking API")
-app.include_router(bookings.router, prefix="/flight-reservation")
+# USE_ASYNC_DB picks the asyncio router; both expose the same endpoints
+bookings_router = bookings_async.router if USE_ASYNC_DB else bookings.router
+app.include_router(bookings_router, prefix="/flight-reservation")
+app.include_router(flights.router, prefix="/flight-reservation")
+# operational endpoints exist only while SQL_PROFILE is on (they are unauthenticated)
+if sql_profiler.SQL_PROFILE:
+    app.include_router(admin.router, prefix="/admin")
+
+# METRICS_ENABLED: per-route latency histograms and a Prometheus scrape endpoint
+if metrics.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware, prefix="/flight-reservation")
+
+    @app.get("/metrics", include_in_schema=False)
+    def scrape_metrics():
+        return metrics.metrics_response()
 
 # create tables only when this module is run as the app (optional)
 if __name__ != "__main__":
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Time, DateTime
+from sqlalchemy import Column, Integer, String, Date, Time, DateTime, Index, ForeignKey, UniqueConstraint, CheckConstraint
 from sqlalchemy.sql import func
 from .db import Base
 
@@ -15,3 +15,34 @@ class Booking(Base):
     booking_reference = Column(String, unique=True, index=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # bumped by every update (optimistic concurrency)
+    flight_class = Column(String, nullable=False, default="Economy", server_default="Economy")
+    flight_id = Column(Integer, ForeignKey("flights.id"), nullable=True, index=True)  # seat held on this flight, if inventoried
+
+    # composite indexes for GET /bookings: equality filters first, then the (date, id)
+    # keyset so every search is an index range scan in page order
+    __table_args__ = (
+        Index("ix_bookings_passenger_date", "passenger_name", "date", "id"),
+        Index("ix_bookings_route_date", "origin", "destination", "date", "id"),
+        Index("ix_bookings_status_date", "status", "date", "id"),
+        Index("ix_bookings_date", "date", "id"),
+    )
+
+class Flight(Base):
+    """One cabin class of one departure; seats_available is the seat counter bookings draw from."""
+    __tablename__ = "flights"
+
+    id = Column(Integer, primary_key=True, index=True)
+    origin = Column(String, nullable=False)
+    destination = Column(String, nullable=False)
+    date = Column(Date, nullable=False)
+    time = Column(Time, nullable=False)
+    flight_class = Column(String, nullable=False, default="Economy")
+    capacity = Column(Integer, nullable=False)
+    seats_available = Column(Integer, nullable=False)
+
+    # the unique departure key doubles as the O(1) lookup index for seat allocation
+    __table_args__ = (
+        UniqueConstraint("origin", "destination", "date", "time", "flight_class", name="uq_flights_departure_class"),
+        CheckConstraint("seats_available >= 0 AND seats_available <= capacity", name="ck_flights_seats_in_range"),
+    )
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date, time
-from typing import Optional
+from typing import List, Optional
 
 # Booking creation
 class BookingCreate(BaseModel):
@@ -20,16 +20,71 @@ class BookingResponse(BaseModel):
     destination: str
     date: date
     time: time
+    version: int = 1
+    flight_class: str = "Economy"
 
     class Config:
         orm_mode = True
 
-# Cancel request
+# Cancel request (expected_version: fail with 409 if the booking changed since it was read)
 class CancelRequest(BaseModel):
     booking_reference: str
+    expected_version: Optional[int] = None
 
 # Reschedule request
 class RescheduleRequest(BaseModel):
     booking_reference: str
     new_date: date
     new_time: time
+    expected_version: Optional[int] = None
+
+# Bulk result for one input item (index = position in the request array)
+class BulkItemResult(BaseModel):
+    index: int
+    ok: bool
+    booking: Optional[BookingResponse] = None
+    error: Optional[str] = None
+
+# Bulk response
+class BulkResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+# Search filters (query parameters of GET /bookings)
+class BookingSearch(BaseModel):
+    passenger_name: Optional[str] = None
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    status: Optional[str] = None
+    limit: int = Field(50, ge=1, le=200)
+    cursor: Optional[str] = None
+
+# One page of search results; pass next_cursor back as ?cursor= for the next page
+class BookingPage(BaseModel):
+    items: List[BookingResponse]
+    next_cursor: Optional[str] = None
+
+# Flight inventory: one cabin class of one departure
+class FlightCreate(BaseModel):
+    origin: str
+    destination: str
+    date: date
+    time: time
+    flight_class: str = "Economy"
+    capacity: int = Field(..., ge=0)
+
+class FlightResponse(BaseModel):
+    id: int
+    origin: str
+    destination: str
+    date: date
+    time: time
+    flight_class: str
+    capacity: int
+    seats_available: int
+
+    class Config:
+        orm_mode = True
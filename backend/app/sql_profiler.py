@@ -0,0 +1,155 @@
+# backend/app/sql_profiler.py
+import os
+import re
+import time
+import logging
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+# Opt-in statement profiling through engine events (replaces echo=True for finding slow SQL):
+# every statement is timed and grouped by its normalized shape; statements slower than
+# SQL_SLOW_MS are logged together with their EXPLAIN plan.
+SQL_PROFILE = os.getenv("SQL_PROFILE", "false").lower() in ("1", "true", "yes")
+SQL_SLOW_MS = float(os.getenv("SQL_SLOW_MS", "100"))
+SQL_PROFILE_WINDOW = int(os.getenv("SQL_PROFILE_WINDOW", "1000"))  # recent timings kept per shape for percentiles
+SQL_EXPLAIN_INTERVAL = float(os.getenv("SQL_EXPLAIN_INTERVAL", "60"))  # seconds between EXPLAINs of one shape
+
+logger = logging.getLogger(__name__)
+
+_NORMALIZE = (
+    (re.compile(r"\s+"), " "),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                      # string literals
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+"), "?"),  # bind parameters of every paramstyle
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),                   # numeric literals
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?, ...)"),  # IN lists / VALUES rows of any length
+    (re.compile(r"(\(\?, \.\.\.\))(?:\s*,\s*\(\?, \.\.\.\))+"), r"\1, ..."),
+)
+
+_EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN ", "mysql": "EXPLAIN ", "mariadb": "EXPLAIN "}
+_EXPLAINABLE = ("select", "update", "delete", "insert", "with")
+
+
+@lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """Statement shape: literals and bind parameters become ?, IN lists of any length one form."""
+    shape = statement.strip()
+    for pattern, repl in _NORMALIZE:
+        shape = pattern.sub(repl, shape)
+    return shape
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, -(-len(sorted_values) * q // 100) - 1))
+    return sorted_values[int(k)]
+
+
+class _ShapeStats:
+    __slots__ = ("count", "total", "max", "slow", "recent", "plan", "last_slow_ms", "explained_at")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self.recent = deque(maxlen=window)
+        self.plan: Optional[str] = None
+        self.last_slow_ms: Optional[float] = None
+        self.explained_at = float("-inf")
+
+
+class SQLProfiler:
+    def __init__(self, slow_ms: float = SQL_SLOW_MS, window: int = SQL_PROFILE_WINDOW,
+                 explain_interval: float = SQL_EXPLAIN_INTERVAL):
+        self.slow_ms = slow_ms
+        self.window = window
+        self.explain_interval = explain_interval
+        self._shapes: Dict[str, _ShapeStats] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, sync_engine):
+        event.listen(sync_engine, "before_cursor_execute", self._before)
+        event.listen(sync_engine, "after_cursor_execute", self._after)
+
+    # the start time lives on the statement's execution context: a statement that raises never
+    # reaches _after, and state kept on the (pooled) connection would then be left behind
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context._sql_profiler_start = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context._sql_profiler_start) * 1000
+        shape = normalize_statement(statement)
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                stats = self._shapes[shape] = _ShapeStats(self.window)
+            stats.count += 1
+            stats.total += elapsed_ms
+            stats.max = max(stats.max, elapsed_ms)
+            stats.recent.append(elapsed_ms)
+            if elapsed_ms < self.slow_ms:
+                return
+            stats.slow += 1
+            stats.last_slow_ms = elapsed_ms
+            now = time.monotonic()
+            explain = not executemany and now - stats.explained_at >= self.explain_interval
+            if explain:
+                stats.explained_at = now
+        plan = self._explain(conn, statement, parameters) if explain else None
+        if plan is not None:
+            stats.plan = plan
+        logger.warning("slow query (%.1f ms): %s%s", elapsed_ms, shape, f"\n  plan: {plan}" if plan else "")
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[str]:
+        prefix = _EXPLAIN_PREFIX.get(conn.dialect.name)
+        if prefix is None or not statement.lstrip().lower().startswith(_EXPLAINABLE):
+            return None
+        # a separate cursor, so the profiled statement's results are untouched; EXPLAIN
+        # (without ANALYZE) only plans the statement, it does not run it again
+        try:
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception as e:
+            return f"EXPLAIN failed: {e}"
+        return " | ".join(str(row[-1]) for row in rows) or None
+
+    def report(self, order_by: str = "total", limit: int = 50) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = [(shape, s.count, s.total, s.max, s.slow, sorted(s.recent), s.plan, s.last_slow_ms)
+                        for shape, s in self._shapes.items()]
+        rows = []
+        for shape, count, total, max_ms, slow, recent, plan, last_slow_ms in snapshot:
+            rows.append({
+                "statement": shape,
+                "count": count,
+                "total_ms": round(total, 3),
+                "mean_ms": round(total / count, 3),
+                "p50_ms": round(_percentile(recent, 50), 3),
+                "p95_ms": round(_percentile(recent, 95), 3),
+                "p99_ms": round(_percentile(recent, 99), 3),
+                "max_ms": round(max_ms, 3),
+                "slow_count": slow,
+                "last_slow_ms": round(last_slow_ms, 3) if last_slow_ms is not None else None,
+                "plan": plan,
+            })
+        key = {"total": "total_ms", "p95": "p95_ms", "p99": "p99_ms", "max": "max_ms", "count": "count",
+               "slow": "slow_count"}.get(order_by, "total_ms")
+        rows.sort(key=lambda r: r[key], reverse=True)
+        return {"enabled": True, "slow_ms": self.slow_ms, "window": self.window, "shapes": rows[:limit]}
+
+    def reset(self):
+        with self._lock:
+            self._shapes.clear()
+
+
+# one profiler for every engine of the process (sync, async and the group-commit writer)
+profiler = SQLProfiler() if SQL_PROFILE else None
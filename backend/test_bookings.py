@@ -0,0 +1,111 @@
+# test_bookings.py
+# Bulk reschedule against a throwaway SQLite database:
+#     python -m pytest backend/test_bookings.py
+import os
+import tempfile
+from datetime import date, time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test_bookings.db")
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from backend.app import models, schemas, inventory, cache, idempotency
+from backend.app.db import Base, SessionLocal, engine
+from backend.app.api import bookings
+
+Base.metadata.create_all(bind=engine)
+
+DAY = date(2025, 10, 10)
+OLD_TIME, NEW_TIME = time(10, 30), time(18, 0)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    session.query(models.Booking).delete()
+    session.query(models.Flight).delete()
+    for t in (OLD_TIME, NEW_TIME):
+        inventory.create_flight(session, schemas.FlightCreate(origin="BOM", destination="DEL", date=DAY, time=t, capacity=5))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _book(db, name):
+    booking = bookings.add_booking(db, schemas.BookingCreate(passenger_name=name, origin="BOM", destination="DEL",
+                                                             date=DAY, time=OLD_TIME))
+    db.commit()
+    return booking.booking_reference
+
+
+def _seats(db):
+    flights = db.query(models.Flight).all()
+    return {f.time: f.seats_available for f in flights}
+
+
+@pytest.mark.parametrize("sane_multi_rowcount", [True, False])
+def test_bulk_reschedule_moves_seats(db, monkeypatch, sane_multi_rowcount):
+    monkeypatch.setattr(engine.dialect, "supports_sane_multi_rowcount", sane_multi_rowcount)
+    refs = [_book(db, "Asha Rao"), _book(db, "Arjun Nair")]
+    response = bookings.bulk_reschedule_bookings(
+        db, [schemas.RescheduleRequest(booking_reference=r, new_date=DAY, new_time=NEW_TIME) for r in refs])
+    db.commit()
+    assert response.succeeded == 2
+    assert _seats(db) == {OLD_TIME: 5, NEW_TIME: 3}
+
+
+@pytest.mark.parametrize("sane_multi_rowcount", [True, False])
+def test_bulk_reschedule_conflict_releases_nothing(db, monkeypatch, sane_multi_rowcount):
+    # asyncpg and psycopg2 report no executemany row counts; the version guard must still hold
+    monkeypatch.setattr(engine.dialect, "supports_sane_multi_rowcount", sane_multi_rowcount)
+    refs = [_book(db, "Asha Rao"), _book(db, "Arjun Nair")]
+    move_seats = bookings._move_seats
+
+    def concurrent_reschedule(session, candidates, errors):
+        # another request reschedules the second booking between our read and our UPDATE
+        session.execute(update(models.Booking).where(models.Booking.booking_reference == refs[1])
+                        .values(version=models.Booking.version + 1).execution_options(synchronize_session=False))
+        return move_seats(session, candidates, errors)
+
+    monkeypatch.setattr(bookings, "_move_seats", concurrent_reschedule)
+    with pytest.raises(HTTPException) as e:
+        bookings.bulk_reschedule_bookings(
+            db, [schemas.RescheduleRequest(booking_reference=r, new_date=DAY, new_time=NEW_TIME) for r in refs])
+    assert e.value.status_code == 409
+    db.rollback()
+    assert _seats(db) == {OLD_TIME: 3, NEW_TIME: 5}
+    assert {b.time for b in db.query(models.Booking)} == {OLD_TIME}
+
+
+def test_cache_outage_after_commit_keeps_the_idempotency_key(db, monkeypatch):
+    ref = _book(db, "Asha Rao")
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("cache down")
+
+    monkeypatch.setattr(cache.booking_cache, "set", unavailable)
+    req = schemas.CancelRequest(booking_reference=ref)
+    first = bookings.cancel_flight(req, idempotency_key="cancel-once", db=db)
+    assert first["status"] == "CANCELLED"
+    # the retry replays the stored response instead of cancelling (and releasing the seat) again
+    replay = bookings.cancel_flight(req, idempotency_key="cancel-once", db=db)
+    assert replay == idempotency.store.get("cancel-flight:cancel-once")["response"]
+    assert _seats(db) == {OLD_TIME: 5, NEW_TIME: 5}
+
+
+def test_read_through_fill_does_not_replace_a_newer_write(db, monkeypatch):
+    ref = _book(db, "Asha Rao")
+    cache.booking_cache.delete(ref)
+    booking_dict = bookings.booking_dict
+
+    def read_then_concurrent_write(booking, **changes):
+        stale = booking_dict(booking, **changes)
+        # a reschedule commits and writes through between this lookup's SELECT and its fill
+        bookings.cache_booking(booking_dict(booking, time=NEW_TIME, version=booking.version + 1))
+        return stale
+
+    monkeypatch.setattr(bookings, "booking_dict", read_then_concurrent_write)
+    assert bookings.get_booking_by_reference(db, ref)["version"] == 1
+    assert cache.booking_cache.get(ref)["version"] == 2
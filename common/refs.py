@@ -0,0 +1,59 @@
+# common/refs.py
+import os
+import time
+import threading
+
+# Booking references are "BK-" followed by a ULID: a 48-bit millisecond timestamp and 80
+# random bits in Crockford base32 (26 characters, no dashes, no I/L/O/U). They sort by
+# creation time, so inserts append at the right edge of the unique booking_reference
+# index and recent references share its hot pages. Within one millisecond the random
+# part is incremented instead of redrawn, so one process never repeats or reorders a
+# reference; across processes 80 fresh random bits per millisecond make a clash
+# negligible, and the unique index plus a retry on insert covers the remainder.
+PREFIX = "BK-"
+_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+
+
+def _encode(value: int) -> str:
+    chars = []
+    for _ in range(26):
+        chars.append(_ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class ReferenceGenerator:
+    def __init__(self, prefix: str = PREFIX):
+        self.prefix = prefix
+        self._reset()
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._last_random = 0
+
+    def new(self) -> str:
+        now_ms = time.time_ns() // 1_000_000
+        with self._lock:
+            if now_ms > self._last_ms:
+                ms, rand = now_ms, int.from_bytes(os.urandom(10), "big")
+            else:
+                # same millisecond, or the wall clock stepped back: stay on the last timestamp
+                ms, rand = self._last_ms, self._last_random + 1
+                if rand > _RANDOM_MAX:
+                    ms, rand = ms + 1, int.from_bytes(os.urandom(10), "big")
+            self._last_ms, self._last_random = ms, rand
+        return self.prefix + _encode((ms << _RANDOM_BITS) | rand)
+
+
+_generator = ReferenceGenerator()
+# a forked worker must not continue the parent's sequence within the same millisecond
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_generator._reset)
+
+
+def new_booking_reference() -> str:
+    """A time-ordered booking reference, e.g. BK-01K7QW3F5C8V9R2M6N4T1XZ0AB."""
+    return _generator.new()
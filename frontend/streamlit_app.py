@@ -1,9 +1,20 @@
 import streamlit as st
 import sys
 import os
+import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from mcp_server.mcp import handle_message  # import your MCP handler directly
+# MCP_MODE=inprocess runs the MCP handler inside Streamlit (development); MCP_MODE=http sends
+# each turn to the MCP service (python -m mcp_server.service) at MCP_SERVICE_URL over pooled connections
+MCP_MODE = os.getenv("MCP_MODE", "inprocess").lower()
+if MCP_MODE == "http":
+    from mcp_server.client import get_client
+    handle_message, handle_message_stream = get_client().handle_message, get_client().handle_message_stream
+else:
+    from mcp_server.mcp import handle_message, handle_message_stream  # import your MCP handler directly
+
+# render the reply while the MCP handler is still working (set MCP_STREAM=false for the spinner)
+MCP_STREAM = os.getenv("MCP_STREAM", "true").lower() in ("1", "true", "yes")
 
 # --- Page setup ---
 st.set_page_config(page_title="Flight Reservation Assistant", page_icon="✈️", layout="centered")
@@ -16,12 +27,16 @@ if "loading" not in st.session_state:
     st.session_state.loading = False
 if "last_user_input" not in st.session_state:
     st.session_state.last_user_input = ""
+if "pending_input" not in st.session_state:
+    st.session_state.pending_input = ""  # submitted message whose reply is streamed below the chat
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex  # lets the MCP layer remember a half-finished request
 
 # --- Helpers ---
 def post_to_mcp(message: str):
     """Call MCP handler directly and return (assistant_text, tool_output). Works with dict or tuple return."""
     try:
-        res = handle_message(message)
+        res = handle_message(message, session_id=st.session_state.session_id)
         if isinstance(res, dict):
             assistant_text = res.get("assistant_text") or res.get("assistant") or ""
             tool_output = res.get("tool_output") or {}
@@ -33,6 +48,33 @@ def post_to_mcp(message: str):
     except Exception as e:
         return f"Error in MCP handler: {type(e).__name__}: {str(e)}", {}
 
+STATUS_TEXT = {"intent": "Looks like a {intent} request...", "tool_call": "Contacting the reservation system ({tool})..."}
+
+def stream_from_mcp(message: str):
+    """Render the reply into the current assistant bubble as MCP events arrive; returns (assistant_text, tool_output)."""
+    placeholder = st.empty()
+    text = ""
+    try:
+        for event in handle_message_stream(message, session_id=st.session_state.session_id):
+            kind = event["type"]
+            if kind == "status":
+                placeholder.markdown(f"_{event['text']}_")
+            elif kind in STATUS_TEXT and not text:
+                placeholder.markdown("_" + STATUS_TEXT[kind].format(**event) + "_")
+            elif kind == "text":
+                text += event["delta"]
+                placeholder.markdown(text + "▌")
+            elif kind == "done":
+                res = event["result"]
+                placeholder.markdown(res.get("assistant_text") or "")
+                return res.get("assistant_text") or "", res.get("tool_output") or {}
+    except Exception as e:
+        text = f"Error in MCP handler: {type(e).__name__}: {str(e)}"
+        placeholder.markdown(text)
+        return text, {}
+    placeholder.markdown(text)
+    return text, {}
+
 def render_tool_output(tool_output):
     """Render booking cards and allow cancel/reschedule actions."""
     shown_refs = []
@@ -117,15 +159,26 @@ with st.form(key="input_form", clear_on_submit=True):
 if submit and user_input:
     st.session_state.last_user_input = user_input
     st.session_state.chat_history.append({"role": "user", "content": user_input})
-    st.session_state.loading = True
-
-    with st.spinner("Assistant is typing..."):
-        assistant_text, tool_output = post_to_mcp(user_input)
-        st.session_state.chat_history.append({"role": "assistant", "content": assistant_text, "tool_output": tool_output})
-    st.session_state.loading = False
+    if MCP_STREAM:
+        st.session_state.pending_input = user_input
+    else:
+        st.session_state.loading = True
+        with st.spinner("Assistant is typing..."):
+            assistant_text, tool_output = post_to_mcp(user_input)
+            st.session_state.chat_history.append({"role": "assistant", "content": assistant_text, "tool_output": tool_output})
+        st.session_state.loading = False
 
 # --- Show chat ---
 render_chat()
 
+# --- Streamed reply to the message just submitted ---
+if st.session_state.pending_input:
+    message, st.session_state.pending_input = st.session_state.pending_input, ""
+    with st.chat_message("assistant"):
+        assistant_text, tool_output = stream_from_mcp(message)
+    if tool_output:
+        render_tool_output(tool_output)
+    st.session_state.chat_history.append({"role": "assistant", "content": assistant_text, "tool_output": tool_output})
+
 if st.session_state.loading:
     st.info("Waiting for assistant...")
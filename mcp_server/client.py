@@ -0,0 +1,71 @@
+# client.py
+"""
+Client for the MCP service (service.py) with the same call shapes as the in-process
+handlers in mcp.py, over one pooled keep-alive session per process.
+"""
+import os
+import json
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Iterator, List, Optional
+
+MCP_SERVICE_URL = os.getenv("MCP_SERVICE_URL", "http://127.0.0.1:8200").rstrip("/")
+MCP_CLIENT_POOL_SIZE = int(os.getenv("MCP_CLIENT_POOL_SIZE", "10"))
+MCP_CLIENT_TIMEOUT = float(os.getenv("MCP_CLIENT_TIMEOUT", "60"))  # seconds; a turn may include LLM and backend calls
+
+
+class MCPServiceError(Exception):
+    pass
+
+
+class MCPClient:
+    def __init__(self, base_url: str = MCP_SERVICE_URL, pool_size: int = MCP_CLIENT_POOL_SIZE,
+                 timeout: float = MCP_CLIENT_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, path: str, payload: Dict[str, Any], stream: bool = False) -> requests.Response:
+        try:
+            resp = self.session.post(self.base_url + path, json=payload, timeout=self.timeout, stream=stream)
+        except requests.RequestException as e:
+            raise MCPServiceError(f"MCP service unreachable: {e}") from e
+        if resp.status_code >= 400:
+            detail = resp.text[:500]
+            resp.close()
+            raise MCPServiceError(f"{resp.status_code} from MCP service: {detail}")
+        return resp
+
+    def handle_message(self, user_text: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        return self._post("/mcp/message", {"message": user_text, "session_id": session_id}).json()
+
+    def handle_messages(self, messages: List[str], concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._post("/mcp/messages", {"messages": messages, "concurrency": concurrency}).json()["results"]
+
+    def handle_message_stream(self, user_text: str, session_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """The events of mcp.handle_message_stream, as the service sends them."""
+        resp = self._post("/mcp/stream", {"message": user_text, "session_id": session_id}, stream=True)
+        try:
+            for line in resp.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    return
+                yield json.loads(data)
+        finally:
+            resp.close()
+
+
+_client: Optional[MCPClient] = None
+
+
+def get_client() -> MCPClient:
+    """Process-wide client, so every caller (and every Streamlit rerun) shares one connection pool."""
+    global _client
+    if _client is None:
+        _client = MCPClient()
+    return _client
@@ -0,0 +1,74 @@
+# conversation.py
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Per-conversation memory of a pending intent and the slots collected so far
+CONVERSATION_TTL = float(os.getenv("CONVERSATION_TTL", "1800"))  # idle seconds before a conversation is forgotten
+CONVERSATION_MAX_SESSIONS = int(os.getenv("CONVERSATION_MAX_SESSIONS", "10000"))
+# optional shared store (e.g. redis://localhost:6379/1) so any MCP worker can continue a conversation
+CONVERSATION_STORE_URL = os.getenv("CONVERSATION_STORE_URL", "")
+
+
+class MemoryConversationStore:
+    """In-process LRU of session_id -> state; entries expire CONVERSATION_TTL after their last write."""
+
+    def __init__(self, maxsize: int = CONVERSATION_MAX_SESSIONS, ttl: float = CONVERSATION_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._data.get(session_id)
+            if item is None:
+                return None
+            expires_at, state = item
+            if expires_at <= time.monotonic():
+                del self._data[session_id]
+                return None
+            self._data.move_to_end(session_id)
+            return state
+
+    def set(self, session_id: str, state: Dict[str, Any]):
+        with self._lock:
+            self._data[session_id] = (time.monotonic() + self.ttl, state)
+            self._data.move_to_end(session_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._data.pop(session_id, None)
+
+
+class RedisConversationStore:
+    def __init__(self, url: str, ttl: float = CONVERSATION_TTL, prefix: str = "conv:"):
+        import redis  # optional dependency, only needed when CONVERSATION_STORE_URL is set
+
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raw = self._client.get(self.prefix + session_id)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, session_id: str, state: Dict[str, Any]):
+        self._client.set(self.prefix + session_id, json.dumps(state), px=int(self.ttl * 1000))
+
+    def delete(self, session_id: str):
+        self._client.delete(self.prefix + session_id)
+
+
+def build_store():
+    if CONVERSATION_STORE_URL:
+        return RedisConversationStore(CONVERSATION_STORE_URL)
+    return MemoryConversationStore()
+
+# session_id -> {"intent": pending intent, "slots": slots collected so far}
+conversation_store = build_store()
@@ -0,0 +1,105 @@
+# gazetteer.py
+import os
+import re
+import csv
+import functools
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+AIRPORTS_CSV = os.getenv("AIRPORTS_CSV", os.path.join(os.path.dirname(__file__), "data", "airports.csv"))
+
+WORD_RE = re.compile(r"[A-Za-z]+")
+_END = ""  # trie key holding the IATA code of the phrase ending at that node
+
+
+class Place(NamedTuple):
+    code: str
+    start: int  # character span in the original text
+    end: int
+    prev_word: str  # lower-cased word right before the match ("from", "to", ...)
+
+
+class Gazetteer:
+    """
+    Airport names, city names and aliases in a word-level prefix trie (nested dicts),
+    plus the set of IATA codes. Codes only match when written in upper case, so words
+    like "del" or "man" in ordinary text are not mistaken for airports.
+    """
+
+    def __init__(self, rows: List[Tuple[str, List[str]]]):
+        self.codes = set()
+        self.trie: Dict = {}
+        for code, names in rows:
+            self.codes.add(code)
+            for name in names:
+                self._insert(name, code)
+
+    def _insert(self, name: str, code: str):
+        node = self.trie
+        for word in WORD_RE.findall(name.lower()):
+            node = node.setdefault(word, {})
+        if node is not self.trie:
+            node[_END] = code
+
+    def find_places(self, text: str) -> List[Place]:
+        """All airport mentions, left to right, longest match first, in one pass over the words."""
+        return self.find_places_in_words([(m.group(), m.start(), m.end()) for m in WORD_RE.finditer(text)])
+
+    def find_places_in_words(self, words: List[Tuple[str, int, int]]) -> List[Place]:
+        """find_places over already tokenized (word, start, end) triples."""
+        lowered = [w.lower() for w, _, _ in words]
+        places = []
+        i = 0
+        while i < len(words):
+            prev_word = lowered[i - 1] if i else ""
+            word, start, end = words[i]
+            node, j, match = self.trie, i, None
+            while j < len(words) and lowered[j] in node:
+                node = node[lowered[j]]
+                j += 1
+                if _END in node:
+                    match = (node[_END], j)
+            if match is not None:
+                code, j = match
+                places.append(Place(code, start, words[j - 1][2], prev_word))
+                i = j
+                continue
+            if len(word) == 3 and word.isupper() and word in self.codes:
+                places.append(Place(word, start, end, prev_word))
+            i += 1
+        return places
+
+    def resolve_route(self, text: str) -> Tuple[str, str]:
+        """
+        (origin, destination) codes. "from X" / "to Y" decide the roles; otherwise
+        mentions are taken in order. Empty strings for what could not be found.
+        """
+        return self._route(self.find_places(text))
+
+    def resolve_route_in_words(self, words: List[Tuple[str, int, int]]) -> Tuple[str, str]:
+        return self._route(self.find_places_in_words(words))
+
+    @staticmethod
+    def _route(places: List[Place]) -> Tuple[str, str]:
+        origin = next((p for p in places if p.prev_word == "from"), None)
+        destination = next((p for p in places if p.prev_word == "to" and p is not origin), None)
+        rest = [p for p in places if p is not origin and p is not destination]
+        if origin is None and rest:
+            origin = rest.pop(0)
+        if destination is None and rest:
+            destination = rest.pop(0)
+        return (origin.code if origin else "", destination.code if destination else "")
+
+
+def load_rows(path: str = AIRPORTS_CSV) -> List[Tuple[str, List[str]]]:
+    rows = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            names = [row["city"]] + (row["aliases"] or "").split("|")
+            rows.append((row["iata"].strip().upper(), [n.strip() for n in names if n.strip()]))
+    return rows
+
+
+@functools.lru_cache(maxsize=None)
+def get_gazetteer(path: Optional[str] = None) -> Gazetteer:
+    """Built on first use and shared afterwards."""
+    return Gazetteer(load_rows(path or AIRPORTS_CSV))
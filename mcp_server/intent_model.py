@@ -0,0 +1,124 @@
+# intent_model.py
+"""
+Local intent classifier: multinomial naive Bayes over word uni/bigrams, trained offline
+from a labeled JSONL corpus ({"text": ..., "intent": ...} per line) and shipped as JSON.
+
+    python -m mcp_server.intent_model train [corpus.jsonl] [model.json]
+"""
+import os
+import re
+import sys
+import json
+import math
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DEFAULT_CORPUS = os.path.join(DATA_DIR, "intent_corpus.jsonl")
+DEFAULT_MODEL = os.path.join(DATA_DIR, "intent_model.json")
+
+# entity shapes are replaced by placeholders so "cancel BK-2025..." generalizes across references
+PLACEHOLDERS = (
+    (re.compile(r"\bBK[-_]?\w+(?:-\w+)*\b", re.I), " <ref> "),
+    (re.compile(r"\d{4}-\d{2}-\d{2}|\d{1,2}[/-]\d{1,2}[/-]\d{4}"), " <date> "),
+    (re.compile(r"\d{1,2}:\d{2}(?::\d{2})?\s*(?:am|pm)?", re.I), " <time> "),
+    (re.compile(r"\b[A-Z]{3}\b"), " <iata> "),
+)
+TOKEN_RE = re.compile(r"<\w+>|[a-z]+")
+
+
+def features(text: str) -> List[str]:
+    for pattern, repl in PLACEHOLDERS:
+        text = pattern.sub(repl, text)
+    tokens = TOKEN_RE.findall(text.lower())
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class IntentModel:
+    def __init__(self, log_priors: Dict[str, float], log_likelihoods: Dict[str, Dict[str, float]],
+                 log_unseen: Dict[str, float]):
+        self.log_priors = log_priors
+        self.log_likelihoods = log_likelihoods
+        self.log_unseen = log_unseen  # smoothed weight of a vocabulary feature never seen with the label
+        self.vocab = set().union(*(ll.keys() for ll in log_likelihoods.values()))
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Most likely intent and its posterior probability. Out-of-vocabulary features are ignored."""
+        feats = [f for f in features(text) if f in self.vocab]
+        scores = {}
+        for label, prior in self.log_priors.items():
+            ll, unseen = self.log_likelihoods[label], self.log_unseen[label]
+            scores[label] = prior + sum(ll.get(f, unseen) for f in feats)
+        best = max(scores, key=scores.get)
+        total = sum(math.exp(s - scores[best]) for s in scores.values())
+        return best, 1.0 / total
+
+    def to_dict(self) -> Dict:
+        return {"log_priors": self.log_priors, "log_likelihoods": self.log_likelihoods, "log_unseen": self.log_unseen}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "IntentModel":
+        return cls(data["log_priors"], data["log_likelihoods"], data["log_unseen"])
+
+
+def train(examples: Iterable[Tuple[str, str]], alpha: float = 0.5) -> IntentModel:
+    label_counts: Counter = Counter()
+    feature_counts: Dict[str, Counter] = defaultdict(Counter)
+    for text, label in examples:
+        label_counts[label] += 1
+        feature_counts[label].update(features(text))
+    vocab = set().union(*feature_counts.values())
+    n = sum(label_counts.values())
+    log_priors, log_likelihoods, log_unseen = {}, {}, {}
+    for label, count in label_counts.items():
+        counts = feature_counts[label]
+        denom = sum(counts.values()) + alpha * len(vocab)
+        log_priors[label] = math.log(count / n)
+        log_likelihoods[label] = {f: round(math.log((c + alpha) / denom), 5) for f, c in counts.items()}
+        log_unseen[label] = math.log(alpha / denom)
+    return IntentModel(log_priors, log_likelihoods, log_unseen)
+
+
+def load_corpus(path: str = DEFAULT_CORPUS) -> List[Tuple[str, str]]:
+    with open(path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(row["text"], row["intent"]) for row in rows]
+
+
+def load_model(path: str = DEFAULT_MODEL) -> Optional[IntentModel]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return IntentModel.from_dict(json.load(f))
+
+
+def save_model(model: IntentModel, path: str = DEFAULT_MODEL):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(model.to_dict(), f, indent=1, sort_keys=True)
+
+
+def _leave_one_out(examples: List[Tuple[str, str]], threshold: float):
+    correct = confident = confident_correct = 0
+    for i, (text, label) in enumerate(examples):
+        model = train(examples[:i] + examples[i + 1:])
+        predicted, confidence = model.predict(text)
+        correct += predicted == label
+        if confidence >= threshold:
+            confident += 1
+            confident_correct += predicted == label
+    n = len(examples)
+    print(f"leave-one-out accuracy: {correct / n:.3f}")
+    print(f"confidence >= {threshold}: {confident / n:.3f} of messages, "
+          f"accuracy {confident_correct / max(confident, 1):.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "train":
+        print(__doc__)
+        sys.exit(1)
+    corpus_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CORPUS
+    model_path = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_MODEL
+    examples = load_corpus(corpus_path)
+    save_model(train(examples), model_path)
+    print(f"trained on {len(examples)} examples -> {model_path}")
+    _leave_one_out(examples, float(os.getenv("LOCAL_INTENT_THRESHOLD", "0.95")))
@@ -1,32 +1,126 @@
 # llm_adapter.py
 import os
-import requests
 import json
 import re
-from typing import Dict
-from .prompt_template import INTENT_PROMPT, SLOT_PROMPT
+import time
+import asyncio
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+from .prompt_template import INTENT_PROMPT, SLOT_PROMPT, COMBINED_PROMPT
+from .llm_cache import llm_cache, make_key, normalize_prompt
+from . import llm_client, intent_model
+from common.metrics import registry
 
 # Toggle between mock and real LLM
 USE_MOCK_LLM = os.getenv("USE_MOCK_LLM", "false").lower() in ("1", "true", "yes")
 
 # OpenAI API config (read key from env)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-OPENAI_API_URL = "https://api.openai.com/v1/chat/completions"
+# point at any OpenAI-compatible server, e.g. the local stub: http://127.0.0.1:8100/v1/chat/completions
+OPENAI_API_URL = os.getenv("OPENAI_API_URL", "https://api.openai.com/v1/chat/completions")
 # Pick a chat-capable model you have access to. Change as needed.
-OPENAI_MODEL_NAME = "gpt-4o-mini"  # or "gpt-4o", "gpt-4o-realtime-preview", etc.
+OPENAI_MODEL_NAME = os.getenv("OPENAI_MODEL_NAME", "gpt-4o-mini")  # or "gpt-4o", "gpt-4o-realtime-preview", etc.
 
-REQUEST_TIMEOUT = 30  # seconds
+REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "30"))  # seconds, per attempt
+
+# Ask for intent and slots in a single call (COMBINED_PROMPT) instead of two sequential ones
+LLM_COMBINED_CALL = os.getenv("LLM_COMBINED_CALL", "false").lower() in ("1", "true", "yes")
+
+# Read completions as a stream (sync path): the intent call stops after its first word and
+# handle_message_stream can report the intent of a combined call before the slots arrive
+LLM_STREAM = os.getenv("LLM_STREAM", "false").lower() in ("1", "true", "yes")
+
+# Fast path: answer intent from the offline-trained local classifier when it is confident enough
+LOCAL_INTENT_ENABLED = os.getenv("LOCAL_INTENT_ENABLED", "true").lower() in ("1", "true", "yes")
+LOCAL_INTENT_THRESHOLD = float(os.getenv("LOCAL_INTENT_THRESHOLD", "0.95"))
+LOCAL_INTENT_MODEL = os.getenv("LOCAL_INTENT_MODEL", intent_model.DEFAULT_MODEL)
+
+INTENTS = ("book", "cancel", "reschedule", "unknown")
+FIRST_WORD_RE = re.compile(r"\s*\w+\W")
+# the intent field of a COMBINED_PROMPT answer, readable before the rest of the JSON has arrived
+STREAMED_INTENT_RE = re.compile(r'"intent"\s*:\s*"(\w+)"')
+LLM_REQUESTS = registry.counter("llm_requests_total", "Requests sent to the LLM endpoint.", ("mode", "outcome"))
+LLM_REQUEST_SECONDS = registry.histogram("llm_request_duration_seconds", "LLM request latency (streams: until the last chunk read).", ("mode",))
+LLM_TOKENS = registry.counter("llm_tokens_total", "Token usage reported by the LLM endpoint.", ("type",))
+SLOT_KEYS = ("passenger_name", "origin", "destination", "date", "time", "booking_reference")
+
+
+def _cache_key(prompt: str, max_tokens: int, temperature: float) -> Optional[str]:
+    # only deterministic calls are cacheable
+    return make_key(prompt, OPENAI_MODEL_NAME, max_tokens=max_tokens) if temperature == 0.0 else None
 
 
 def _call_openai(prompt: str, max_tokens: int = 60, temperature: float = 0.0) -> str:
     """
     Call OpenAI Chat Completions endpoint and return the assistant text.
     Uses the messages format with a single user message containing the prompt.
+    Temperature-0 answers are served from / stored in llm_cache; failures are never cached.
     """
-    if not OPENAI_API_KEY:
-        print("OPENAI_API_KEY not set in environment")
-        return ""
+    if LLM_STREAM:
+        return "".join(_call_openai_stream(prompt, max_tokens, temperature)).strip()
+    key = _cache_key(prompt, max_tokens, temperature)
+    if key is not None:
+        text = llm_cache.get(key)
+        if text is not None:
+            return text
+    text = _request_completion(prompt, max_tokens, temperature)
+    if text and key is not None:
+        llm_cache.set(key, text)
+    return text
+
+
+def _call_openai_stream(prompt: str, max_tokens: int = 60, temperature: float = 0.0) -> Iterator[str]:
+    """
+    _call_openai as a stream of text deltas. A cache hit arrives as a single delta; a streamed
+    completion is cached only when it was read to the end.
+    """
+    key = _cache_key(prompt, max_tokens, temperature)
+    if key is not None:
+        text = llm_cache.get(key)
+        if text is not None:
+            yield text
+            return
+    parts = []
+    try:
+        for delta in _stream_completion(prompt, max_tokens, temperature):
+            parts.append(delta)
+            yield delta
+    except Exception as e:
+        print("OpenAI stream failed:", e)
+        return
+    text = "".join(parts).strip()
+    if text and key is not None:
+        llm_cache.set(key, text)
+
 
+# cache key -> task of the request already in flight for it (identical prompts share one call)
+_inflight: Dict[str, "asyncio.Task"] = {}
+
+
+async def _call_openai_async(prompt: str, max_tokens: int = 60, temperature: float = 0.0) -> str:
+    """Same as _call_openai on the pooled async client, so several calls can be in flight at once."""
+    key = _cache_key(prompt, max_tokens, temperature)
+    if key is None:
+        return await _request_completion_async(prompt, max_tokens, temperature)
+    text = llm_cache.get(key)
+    if text is not None:
+        return text
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_request_completion_async(prompt, max_tokens, temperature))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _inflight.pop(key, None) if _inflight.get(key) is t else None)
+    text = await asyncio.shield(task)
+    if text:
+        llm_cache.set(key, text)
+    return text
+
+
+def cache_stats() -> Dict:
+    return llm_cache.stats()
+
+
+def _build_request(prompt: str, max_tokens: int, temperature: float):
     headers = {
         "Authorization": f"Bearer {OPENAI_API_KEY}",
         "Content-Type": "application/json",
@@ -41,85 +135,149 @@ def _call_openai(prompt: str, max_tokens: int = 60, temperature: float = 0.0) ->
         "max_tokens": max_tokens,
         "n": 1,
     }
+    return headers, payload
+
 
+def _extract_text(data: Dict) -> str:
+    # best-effort extract text
+    choices = data.get("choices") or []
+    if not choices:
+        return ""
+    # Chat-style
+    msg = choices[0].get("message", {}) if isinstance(choices[0], dict) else {}
+    text = msg.get("content") or choices[0].get("text") or ""
+    if isinstance(text, list):
+        text = " ".join([t.get("content", "") for t in text])
+    return text.strip()
+
+
+def _record_llm_call(mode: str, outcome: str, start: float, usage: Optional[Dict] = None):
+    LLM_REQUESTS.labels(mode, outcome).inc()
+    LLM_REQUEST_SECONDS.labels(mode).observe(time.perf_counter() - start)
+    if usage:
+        LLM_TOKENS.labels("prompt").inc(usage.get("prompt_tokens") or 0)
+        LLM_TOKENS.labels("completion").inc(usage.get("completion_tokens") or 0)
+
+
+def _request_completion(prompt: str, max_tokens: int, temperature: float) -> str:
+    if not OPENAI_API_KEY:
+        print("OPENAI_API_KEY not set in environment")
+        return ""
+    headers, payload = _build_request(prompt, max_tokens, temperature)
+    start = time.perf_counter()
     try:
-        resp = requests.post(OPENAI_API_URL, headers=headers, json=payload, timeout=REQUEST_TIMEOUT)
-        resp.raise_for_status()
-        data = resp.json()
-        # best-effort extract text
-        choices = data.get("choices") or []
-        if not choices:
-            return ""
-        # Chat-style
-        msg = choices[0].get("message", {}) if isinstance(choices[0], dict) else {}
-        text = msg.get("content") or choices[0].get("text") or ""
-        if isinstance(text, list):
-            text = " ".join([t.get("content", "") for t in text])
-        return text.strip()
+        data = llm_client.post_json(OPENAI_API_URL, headers, payload, REQUEST_TIMEOUT)
     except Exception as e:
         # non-fatal: print for debugging and return empty string to fallback
-        print("OpenAI call failed:", e, getattr(e, "response", ""))
-        try:
-            # attempt to surface useful json if present
-            print("response:", resp.text)
-        except Exception:
-            pass
+        _record_llm_call("sync", "error", start)
+        print("OpenAI call failed:", e)
         return ""
+    _record_llm_call("sync", "ok", start, data.get("usage"))
+    return _extract_text(data)
 
 
-def generate_intent(user_input: str) -> str:
-    """
-    Use OpenAI to generate a single-word intent: book/cancel/reschedule/unknown.
-    Falls back to simple rule-based detection if USE_MOCK_LLM or OpenAI fails.
-    """
-    if USE_MOCK_LLM:
-        ui = user_input.lower()
-        if "book" in ui or "reserve" in ui:
-            return "book"
-        if "cancel" in ui:
-            return "cancel"
-        if "reschedule" in ui or "change" in ui:
-            return "reschedule"
-        return "unknown"
+def _stream_completion(prompt: str, max_tokens: int, temperature: float) -> Iterator[str]:
+    """Text deltas of one streamed completion; raises on failure. Closing it early drops the response."""
+    if not OPENAI_API_KEY:
+        print("OPENAI_API_KEY not set in environment")
+        return
+    headers, payload = _build_request(prompt, max_tokens, temperature)
+    # ask for the usage chunk that ends a stream (not sent when the reader stops early)
+    payload["stream_options"] = {"include_usage": True}
+    usage, outcome, start = None, "ok", time.perf_counter()
+    try:
+        for chunk in llm_client.stream_sse(OPENAI_API_URL, headers, payload, REQUEST_TIMEOUT):
+            usage = chunk.get("usage") or usage
+            choices = chunk.get("choices") or [{}]
+            delta = (choices[0].get("delta") or {}).get("content") or ""
+            if delta:
+                yield delta
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        # also when the reader stopped early (generate_intent's first word)
+        _record_llm_call("stream", outcome, start, usage)
+
+
+async def _request_completion_async(prompt: str, max_tokens: int, temperature: float) -> str:
+    if not OPENAI_API_KEY:
+        print("OPENAI_API_KEY not set in environment")
+        return ""
+    headers, payload = _build_request(prompt, max_tokens, temperature)
+    start = time.perf_counter()
+    try:
+        data = await llm_client.post_json_async(OPENAI_API_URL, headers, payload, REQUEST_TIMEOUT)
+    except Exception as e:
+        _record_llm_call("async", "error", start)
+        print("OpenAI call failed:", e)
+        return ""
+    _record_llm_call("async", "ok", start, data.get("usage"))
+    return _extract_text(data)
+
+
+_local_model = intent_model.load_model(LOCAL_INTENT_MODEL) if LOCAL_INTENT_ENABLED else None
+_local_stats = {"local": 0, "escalated": 0}
+_local_stats_lock = threading.Lock()  # local_intent runs on FastAPI's threadpool
+
+
+def local_intent(user_input: str) -> Optional[str]:
+    """Intent from the local classifier, or None when it is unsure (or disabled) and the LLM should decide."""
+    if _local_model is None:
+        return None
+    intent, confidence = _local_model.predict(user_input)
+    outcome = "local" if confidence >= LOCAL_INTENT_THRESHOLD else "escalated"
+    with _local_stats_lock:
+        _local_stats[outcome] += 1
+    return intent if outcome == "local" else None
+
+
+def local_intent_stats() -> Dict:
+    with _local_stats_lock:
+        stats = dict(_local_stats)
+    total = stats["local"] + stats["escalated"]
+    return {
+        "enabled": _local_model is not None,
+        "threshold": LOCAL_INTENT_THRESHOLD,
+        **stats,
+        "local_fraction": round(stats["local"] / total, 4) if total else 0.0,
+    }
+
+
+def rule_based_intent(user_input: str) -> str:
+    ui = user_input.lower()
+    if "book" in ui or "reserve" in ui:
+        return "book"
+    if "cancel" in ui:
+        return "cancel"
+    if "reschedule" in ui or "change" in ui:
+        return "reschedule"
+    return "unknown"
+
 
-    prompt = INTENT_PROMPT.format(user_input=user_input)
-    text = _call_openai(prompt, max_tokens=12, temperature=0.0).lower().strip()
+def empty_slots() -> Dict[str, str]:
+    return {k: "" for k in SLOT_KEYS}
 
+
+def _intent_prompt(user_input: str) -> str:
+    # intent does not depend on case, so "Cancel BK-1" and "cancel bk-1" share a cache entry
+    return INTENT_PROMPT.format(user_input=normalize_prompt(user_input).lower())
+
+
+def _parse_intent(text: str) -> str:
+    text = text.lower().strip()
     if not text:
         return "unknown"
     # keep only first token-like word
     text = re.split(r"\s+|\W+", text)[0]
-    if text in {"book", "cancel", "reschedule", "unknown"}:
+    if text in INTENTS:
         return text
     return "unknown"
 
 
-def llm_extract_slots(user_input: str) -> Dict[str, str]:
-    """
-    Use OpenAI to extract slots in a strict JSON format.
-    If OpenAI fails or returns invalid JSON, return empty slots.
-    """
-    if USE_MOCK_LLM:
-        return {
-            "passenger_name": "",
-            "origin": "",
-            "destination": "",
-            "date": "",
-            "time": "",
-            "booking_reference": ""
-        }
-
-    prompt = SLOT_PROMPT.format(user_input=user_input)
-    text = _call_openai(prompt, max_tokens=300, temperature=0.0)
+def _parse_slots(text: str) -> Dict[str, str]:
     if not text:
-        return {
-            "passenger_name": "",
-            "origin": "",
-            "destination": "",
-            "date": "",
-            "time": "",
-            "booking_reference": ""
-        }
+        return empty_slots()
 
     raw = text.strip()
     # remove code fences/backticks if present
@@ -132,7 +290,7 @@ def llm_extract_slots(user_input: str) -> Dict[str, str]:
             json_text = raw[s:e+1]
             parsed = json.loads(json_text)
             # ensure all keys exist
-            for k in ["passenger_name", "origin", "destination", "date", "time", "booking_reference"]:
+            for k in SLOT_KEYS:
                 parsed.setdefault(k, "")
             # ensure values are strings
             parsed = {k: (str(v) if v is not None else "") for k, v in parsed.items()}
@@ -141,11 +299,145 @@ def llm_extract_slots(user_input: str) -> Dict[str, str]:
         print("Failed to parse JSON from OpenAI slot extractor:", ex, "raw:", raw)
 
     # fallback empty
-    return {
-        "passenger_name": "",
-        "origin": "",
-        "destination": "",
-        "date": "",
-        "time": "",
-        "booking_reference": ""
-    }
+    return empty_slots()
+
+
+def generate_intent(user_input: str, use_local: bool = True) -> str:
+    """
+    Use OpenAI to generate a single-word intent: book/cancel/reschedule/unknown.
+    Falls back to simple rule-based detection if USE_MOCK_LLM or OpenAI fails.
+    Confident local-classifier answers skip the OpenAI call (use_local=False forces it).
+    """
+    if USE_MOCK_LLM:
+        return rule_based_intent(user_input)
+    intent = local_intent(user_input) if use_local else None
+    if intent is not None:
+        return intent
+    if LLM_STREAM:
+        return _parse_intent(_first_word(_intent_prompt(user_input), max_tokens=12))
+    return _parse_intent(_call_openai(_intent_prompt(user_input), max_tokens=12, temperature=0.0))
+
+
+def _first_word(prompt: str, max_tokens: int) -> str:
+    """
+    Stream a one-word answer only until that word is complete, then drop the stream. The
+    word is what gets cached, since the stream is never read to the end.
+    """
+    key = _cache_key(prompt, max_tokens, 0.0)
+    if key is not None:
+        text = llm_cache.get(key)
+        if text is not None:
+            return text
+    text, stream = "", _stream_completion(prompt, max_tokens, 0.0)
+    try:
+        for delta in stream:
+            text += delta
+            if FIRST_WORD_RE.match(text):
+                break
+    except Exception as e:
+        print("OpenAI stream failed:", e)
+        return ""
+    finally:
+        stream.close()
+    text = text.strip()
+    if text and key is not None:
+        llm_cache.set(key, text)
+    return text
+
+
+async def generate_intent_async(user_input: str, use_local: bool = True) -> str:
+    if USE_MOCK_LLM:
+        return rule_based_intent(user_input)
+    intent = local_intent(user_input) if use_local else None
+    if intent is not None:
+        return intent
+    return _parse_intent(await _call_openai_async(_intent_prompt(user_input), max_tokens=12, temperature=0.0))
+
+
+def llm_extract_slots(user_input: str) -> Dict[str, str]:
+    """
+    Use OpenAI to extract slots in a strict JSON format.
+    If OpenAI fails or returns invalid JSON, return empty slots.
+    """
+    if USE_MOCK_LLM:
+        return empty_slots()
+    return _parse_slots(_call_openai(SLOT_PROMPT.format(user_input=user_input), max_tokens=300, temperature=0.0))
+
+
+async def llm_extract_slots_async(user_input: str) -> Dict[str, str]:
+    if USE_MOCK_LLM:
+        return empty_slots()
+    return _parse_slots(await _call_openai_async(SLOT_PROMPT.format(user_input=user_input), max_tokens=300, temperature=0.0))
+
+
+def parse_combined_response(text: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    Strict parser for COMBINED_PROMPT output: exactly one JSON object (code fences allowed)
+    with a known intent and every slot key, all values strings or null. Anything else
+    returns None so the caller can fall back to the two-call path.
+    """
+    raw = text.strip().strip("`").strip()
+    if raw.startswith("json"):
+        raw = raw[4:].lstrip()
+    try:
+        parsed = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(parsed, dict) or set(parsed) != {"intent", *SLOT_KEYS}:
+        return None
+    intent = parsed["intent"]
+    if not isinstance(intent, str) or intent.strip().lower() not in INTENTS:
+        return None
+    slots = {}
+    for k in SLOT_KEYS:
+        v = parsed[k]
+        if v is not None and not isinstance(v, str):
+            return None
+        slots[k] = (v or "").strip()
+    return intent.strip().lower(), slots
+
+
+def _parse_combined_or_log(text: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    if not text:
+        return None
+    result = parse_combined_response(text)
+    if result is None:
+        print("Combined LLM response did not parse, falling back to separate calls. raw:", text)
+    return result
+
+
+def llm_intent_and_slots(user_input: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    One OpenAI round trip for both intent and slots. Returns None if the call fails
+    or the answer does not parse strictly.
+    """
+    if USE_MOCK_LLM:
+        return None
+    return _parse_combined_or_log(_call_openai(COMBINED_PROMPT.format(user_input=user_input), max_tokens=300, temperature=0.0))
+
+
+async def llm_intent_and_slots_async(user_input: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    if USE_MOCK_LLM:
+        return None
+    text = await _call_openai_async(COMBINED_PROMPT.format(user_input=user_input), max_tokens=300, temperature=0.0)
+    return _parse_combined_or_log(text)
+
+
+def llm_intent_and_slots_stream(user_input: str) -> Iterator[Tuple[str, object]]:
+    """
+    llm_intent_and_slots over a streamed completion: yields ("intent", intent) as soon as
+    the intent field has arrived (when it is a known intent), then ("result", parsed or None).
+    """
+    if USE_MOCK_LLM:
+        yield "result", None
+        return
+    text, intent_seen = "", False
+    for delta in _call_openai_stream(COMBINED_PROMPT.format(user_input=user_input), max_tokens=300, temperature=0.0):
+        text += delta
+        if not intent_seen:
+            m = STREAMED_INTENT_RE.search(text)
+            if m:
+                intent_seen = True
+                if m.group(1).lower() in INTENTS:
+                    yield "intent", m.group(1).lower()
+    yield "result", _parse_combined_or_log(text.strip())
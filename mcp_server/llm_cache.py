@@ -0,0 +1,201 @@
+# llm_cache.py
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Cache of LLM completions; only deterministic (temperature 0) calls are cached
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "2048"))  # in-memory entries
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+# optional on-disk tier (a SQLite file) that survives restarts, e.g. LLM_CACHE_PATH=./llm_cache.db
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+LLM_CACHE_DISK_MAX_ENTRIES = int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "100000"))
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so prompts that differ only in spacing share an entry."""
+    return _WS_RE.sub(" ", prompt).strip()
+
+
+def make_key(prompt: str, model: str, **params: Any) -> str:
+    raw = json.dumps({"p": normalize_prompt(prompt), "m": model, **params}, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _MemoryTier:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, expires_at: Optional[float] = None):
+        self._data[key] = (expires_at or time.time() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class _DiskTier:
+    """SQLite-backed tier; oldest-used rows are pruned once it grows past max_entries."""
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_used_at ON llm_cache (used_at)")
+        self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        self._writes = 0
+
+    def get(self, key: str):
+        row = self._conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        now = time.time()
+        if expires_at <= now:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            return None
+        self._conn.execute("UPDATE llm_cache SET used_at = ? WHERE key = ?", (now, key))
+        return value, expires_at
+
+    def set(self, key: str, value: str) -> float:
+        now = time.time()
+        expires_at = now + self.ttl
+        self._conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+            (key, value, expires_at, now),
+        )
+        self._writes += 1
+        if self._writes % 256 == 0:  # amortize the size check instead of counting on every write
+            self._prune()
+        return expires_at
+
+    def _prune(self):
+        self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY used_at LIMIT ?)", (excess,)
+            )
+            self.evictions += excess
+
+    def clear(self):
+        self._conn.execute("DELETE FROM llm_cache")
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for LLM completions: an in-process LRU in front of an optional
+    SQLite file. Disk hits are promoted into memory with their original expiry.
+    """
+
+    def __init__(self, maxsize: int = LLM_CACHE_SIZE, ttl: float = LLM_CACHE_TTL,
+                 path: str = LLM_CACHE_PATH, disk_max_entries: int = LLM_CACHE_DISK_MAX_ENTRIES):
+        self.memory = _MemoryTier(maxsize, ttl)
+        self.disk = _DiskTier(path, ttl, disk_max_entries) if path else None
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self.memory.get(key)
+            if value is not None:
+                self.memory_hits += 1
+                return value
+            if self.disk is not None:
+                found = self.disk.get(key)
+                if found is not None:
+                    value, expires_at = found
+                    self.memory.set(key, value, expires_at)
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            expires_at = self.disk.set(key, value) if self.disk is not None else None
+            self.memory.set(key, value, expires_at)
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+            if self.disk is not None:
+                self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            out = {
+                "enabled": True,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_size": len(self.memory),
+                "memory_evictions": self.memory.evictions,
+            }
+            if self.disk is not None:
+                out["disk_size"] = len(self.disk)
+                out["disk_evictions"] = self.disk.evictions
+            return out
+
+
+class NullLLMCache:
+    """Used when LLM_CACHE_ENABLED is off: every call goes to the model."""
+
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, value: str):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+
+llm_cache = LLMResponseCache() if LLM_CACHE_ENABLED else NullLLMCache()
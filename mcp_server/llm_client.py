@@ -0,0 +1,149 @@
+# llm_client.py
+import os
+import json
+import time
+import random
+import asyncio
+import weakref
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Iterator, Optional
+
+# HTTP transport for the chat completions endpoint: pooled keep-alive connections
+# (sync via requests.Session, async via httpx.AsyncClient) with bounded, jittered retries.
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.25"))  # seconds
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "4"))  # seconds
+
+# rate limits, timeouts and server-side failures; 4xx otherwise means the request itself is wrong
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMRequestError(Exception):
+    pass
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Full-jitter exponential backoff; a server-provided Retry-After wins when it is a number."""
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt))
+
+
+# ----------------- SYNC -----------------
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=LLM_POOL_SIZE, pool_maxsize=LLM_POOL_SIZE)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _session = session
+    return _session
+
+
+def post_json(url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        last_attempt = attempt == LLM_MAX_RETRIES
+        try:
+            resp = get_session().post(url, headers=headers, json=payload, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if last_attempt:
+                raise LLMRequestError(str(e)) from e
+            time.sleep(backoff_delay(attempt))
+            continue
+        if resp.status_code in RETRY_STATUSES and not last_attempt:
+            time.sleep(backoff_delay(attempt, resp.headers.get("Retry-After")))
+            continue
+        if resp.status_code >= 400:
+            raise LLMRequestError(f"{resp.status_code} from LLM endpoint: {resp.text[:500]}")
+        return resp.json()
+
+
+# ----------------- ASYNC -----------------
+# httpx clients are bound to the event loop they first ran on, so keep one per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def get_async_client():
+    import httpx  # optional dependency, only needed for the async path
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        limits = httpx.Limits(max_connections=LLM_POOL_SIZE, max_keepalive_connections=LLM_POOL_SIZE)
+        client = httpx.AsyncClient(limits=limits)
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_client():
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def post_json_async(url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    import httpx
+
+    client = get_async_client()
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        last_attempt = attempt == LLM_MAX_RETRIES
+        try:
+            resp = await client.post(url, headers=headers, json=payload, timeout=timeout)
+        except httpx.TransportError as e:  # connect/read errors and timeouts
+            if last_attempt:
+                raise LLMRequestError(str(e)) from e
+            await asyncio.sleep(backoff_delay(attempt))
+            continue
+        if resp.status_code in RETRY_STATUSES and not last_attempt:
+            await asyncio.sleep(backoff_delay(attempt, resp.headers.get("Retry-After")))
+            continue
+        if resp.status_code >= 400:
+            raise LLMRequestError(f"{resp.status_code} from LLM endpoint: {resp.text[:500]}")
+        return resp.json()
+
+
+# ----------------- STREAMING -----------------
+def stream_sse(url: str, headers: Dict[str, str], payload: Dict[str, Any], timeout: float) -> Iterator[Dict[str, Any]]:
+    """
+    POST with "stream": true and yield each server-sent event's JSON (OpenAI chunk format)
+    until [DONE]. Failures before the first event are retried like post_json; once data
+    has been yielded the stream cannot be replayed, so later errors propagate.
+    """
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        last_attempt = attempt == LLM_MAX_RETRIES
+        try:
+            resp = get_session().post(url, headers=headers, json={**payload, "stream": True}, timeout=timeout, stream=True)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if last_attempt:
+                raise LLMRequestError(str(e)) from e
+            time.sleep(backoff_delay(attempt))
+            continue
+        if resp.status_code in RETRY_STATUSES and not last_attempt:
+            resp.close()
+            time.sleep(backoff_delay(attempt, resp.headers.get("Retry-After")))
+            continue
+        if resp.status_code >= 400:
+            detail = resp.text[:500]
+            resp.close()
+            raise LLMRequestError(f"{resp.status_code} from LLM endpoint: {detail}")
+        break
+    try:
+        for line in resp.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                return
+            yield json.loads(data)
+    finally:
+        # also runs when the consumer stops early, which drops the rest of the completion
+        resp.close()
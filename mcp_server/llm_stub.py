@@ -0,0 +1,118 @@
+# llm_stub.py
+"""
+Local OpenAI-compatible stand-in for load tests and offline development.
+
+    python -m mcp_server.llm_stub            # listens on 127.0.0.1:8100
+    OPENAI_API_URL=http://127.0.0.1:8100/v1/chat/completions OPENAI_API_KEY=stub ...
+
+Answers come from the same rules as USE_MOCK_LLM (keyword intent, regex slots),
+shaped like the real prompts expect, after a configurable delay. Requests with
+"stream": true get server-sent chat.completion.chunk events, one token per word.
+"""
+import os
+import re
+import json
+import time
+import uuid
+import random
+import asyncio
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from .llm_adapter import rule_based_intent
+from .mcp import regex_slot_extraction
+
+LLM_STUB_HOST = os.getenv("LLM_STUB_HOST", "127.0.0.1")
+LLM_STUB_PORT = int(os.getenv("LLM_STUB_PORT", "8100"))
+LLM_STUB_LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", "300"))
+LLM_STUB_JITTER_MS = float(os.getenv("LLM_STUB_JITTER_MS", "100"))
+# delay between streamed tokens; LLM_STUB_LATENCY_MS is then the time to the first token
+LLM_STUB_TOKEN_MS = float(os.getenv("LLM_STUB_TOKEN_MS", "20"))
+# fraction of requests answered with 503, to exercise client retries
+LLM_STUB_ERROR_RATE = float(os.getenv("LLM_STUB_ERROR_RATE", "0"))
+
+USER_INPUT_RES = (
+    re.compile(r'"""(.*?)"""', re.S),         # SLOT_PROMPT / COMBINED_PROMPT
+    re.compile(r'User message: "(.*)"', re.S),  # INTENT_PROMPT
+)
+
+app = FastAPI(title="LLM stub")
+
+
+def _user_input(prompt: str) -> str:
+    for pattern in USER_INPUT_RES:
+        m = pattern.search(prompt)
+        if m:
+            return m.group(1).strip()
+    return prompt
+
+
+def answer(prompt: str) -> str:
+    """The completion a well-behaved model would give for one of our prompts."""
+    user_input = _user_input(prompt)
+    if '"intent"' in prompt:
+        return json.dumps({"intent": rule_based_intent(user_input), **regex_slot_extraction(user_input)})
+    if "information extractor" in prompt:
+        return json.dumps(regex_slot_extraction(user_input))
+    return rule_based_intent(user_input)
+
+
+async def _delay():
+    latency = LLM_STUB_LATENCY_MS + random.uniform(-LLM_STUB_JITTER_MS, LLM_STUB_JITTER_MS)
+    await asyncio.sleep(max(latency, 0) / 1000)
+
+
+def _usage(prompt: str, content: str) -> Dict[str, int]:
+    prompt_tokens, completion_tokens = len(prompt.split()), len(content.split())
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+async def _stream(content: str, model: str, usage: Optional[Dict[str, int]]):
+    chunk_id, created = f"chatcmpl-{uuid.uuid4().hex}", int(time.time())
+
+    def event(delta: Dict[str, Any], finish_reason=None) -> str:
+        chunk = {"id": chunk_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                 "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    yield event({"role": "assistant"})
+    for i, token in enumerate(re.findall(r"\S+\s*", content)):
+        if i:
+            await asyncio.sleep(LLM_STUB_TOKEN_MS / 1000)
+        yield event({"content": token})
+    yield event({}, "stop")
+    if usage is not None:
+        # stream_options.include_usage: one last chunk without choices, as OpenAI sends it
+        chunk = {"id": chunk_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                 "choices": [], "usage": usage}
+        yield f"data: {json.dumps(chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: Dict[str, Any]):
+    await _delay()
+    if LLM_STUB_ERROR_RATE and random.random() < LLM_STUB_ERROR_RATE:
+        return JSONResponse(status_code=503, content={"error": {"message": "stub overloaded"}})
+    prompt = body["messages"][-1]["content"]
+    content = answer(prompt)
+    if body.get("stream"):
+        usage = _usage(prompt, content) if (body.get("stream_options") or {}).get("include_usage") else None
+        return StreamingResponse(_stream(content, body.get("model", "stub"), usage), media_type="text/event-stream")
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": _usage(prompt, content),
+    }
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=LLM_STUB_HOST, port=LLM_STUB_PORT, log_level="warning")
@@ -1,116 +1,304 @@
 # mcp.py
+import os
 import re
 import json
-from datetime import datetime
-from typing import Dict, Any
+import uuid
+import asyncio
+from collections import defaultdict
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
-from .llm_adapter import generate_intent, llm_extract_slots, USE_MOCK_LLM
-from .tools import book_tool, cancel_tool, reschedule_tool
+from .llm_adapter import (generate_intent, llm_extract_slots, llm_intent_and_slots, USE_MOCK_LLM, LLM_COMBINED_CALL,
+                          generate_intent_async, llm_extract_slots_async, llm_intent_and_slots_async, local_intent,
+                          llm_intent_and_slots_stream, rule_based_intent, SLOT_KEYS)
+from .tools import book_tool, cancel_tool, reschedule_tool, bulk_book_tool, bulk_cancel_tool, bulk_reschedule_tool
+from .slot_scanner import BK_REF_RE, scan_slots, scan_slots_batch
+from .gazetteer import get_gazetteer
+from .conversation import conversation_store
+from common.metrics import registry
 
 # Use LLM to extract slots if regex heuristics fail
 USE_LLM_FOR_SLOTS = not USE_MOCK_LLM
 
-# regex heuristics for common slot patterns
-DATE_RE = re.compile(r"(?P<date>\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}-\d{1,2}-\d{4})")
-TIME_RE = re.compile(r"(?P<time>\d{1,2}:\d{2}(?::\d{2})?\s*(?:am|pm)?)", re.I)
-IATA_RE = re.compile(r"\b([A-Z]{3})\b")
-BK_REF_RE = re.compile(r"\b(BK[-_]?[\w\d]+)\b", re.I)
-FROM_TO_RE = re.compile(r"from\s+([A-Za-z0-9\s,]+?)\s+(?:to|->|-)\s+([A-Za-z0-9\s,]+)", re.I)
-NAME_RE = re.compile(r"(?:name is|this is|i am|passenger is)\s+([A-Z][a-zA-Z\s]{1,40})", re.I)
+# handle_messages: messages understood concurrently, and items per bulk backend request
+MCP_BATCH_CONCURRENCY = int(os.getenv("MCP_BATCH_CONCURRENCY", "32"))
+MCP_BULK_CHUNK = int(os.getenv("MCP_BULK_CHUNK", "500"))
 
-def _normalize_date(found: str) -> str:
-    if not found:
-        return ""
-    found = found.strip()
-    if re.match(r"\d{4}-\d{2}-\d{2}", found):
-        return found
-    parts = re.split(r"[-/]", found)
-    if len(parts) == 3:
-        if len(parts[0]) == 4:
-            y,m,d = parts
-        else:
-            d,m,y = parts
-        try:
-            dt = datetime(int(y), int(m), int(d))
-            return dt.strftime("%Y-%m-%d")
-        except Exception:
-            return found
-    return found
-
-def _normalize_time(found: str) -> str:
-    if not found:
-        return ""
-    try:
-        t = found.strip().lower()
-        t = re.sub(r"\s+", "", t)
-        if re.search(r"(am|pm)$", t):
-            dt = datetime.strptime(t, "%I:%M%p")
-            return dt.strftime("%H:%M")
-        if re.match(r"\d{1,2}:\d{2}(:\d{2})?", t):
-            hh, mm = t.split(":")[:2]
-            return f"{int(hh):02d}:{int(mm):02d}"
-    except Exception:
-        return found
-    return found
+# intent / slots (intent_slots for one combined LLM call, understand when both run concurrently),
+# tool (backend call) and total, per handled message
+MCP_STAGE_SECONDS = registry.histogram("mcp_stage_duration_seconds", "Time spent in each handle_message stage.", ("stage",))
+MCP_MESSAGES = registry.counter("mcp_messages_total", "Messages handled, by intent.", ("intent",))
 
 def regex_slot_extraction(user_input: str) -> Dict[str,str]:
-    ui = user_input.strip()
-    slots = {"passenger_name":"", "origin":"", "destination":"", "date":"", "time":"", "booking_reference":""}
+    # one pass over the message (slot_scanner), airports resolved through the gazetteer
+    return scan_slots(user_input)
 
-    m = BK_REF_RE.search(ui)
-    if m:
-        slots["booking_reference"] = m.group(1)
-
-    m = NAME_RE.search(ui)
-    if m:
-        slots["passenger_name"] = m.group(1).strip()
+def regex_slot_extraction_batch(messages: List[str]) -> List[Dict[str,str]]:
+    return scan_slots_batch(messages)
 
-    m = DATE_RE.search(ui)
-    if m:
-        slots["date"] = _normalize_date(m.group("date"))
-
-    m = TIME_RE.search(ui)
-    if m:
-        slots["time"] = _normalize_time(m.group("time"))
-
-    codes = IATA_RE.findall(ui)
-    if len(codes) >= 2:
-        slots["origin"] = codes[0]
-        slots["destination"] = codes[1]
-    else:
-        m = FROM_TO_RE.search(ui)
-        if m:
-            origin = m.group(1).strip().split(",")[0].strip()
-            dest = m.group(2).strip().split(",")[0].strip()
-            slots["origin"] = origin
-            slots["destination"] = dest
-
-    return slots
+def _is_meaningful(slots: Dict[str,str]) -> bool:
+    # consider meaningful if any slot (except booking_reference) present or ref present
+    return bool(any(v for k,v in slots.items() if k != "booking_reference") or slots["booking_reference"])
 
 def extract_slots(user_input: str) -> Dict[str,str]:
     slots = regex_slot_extraction(user_input)
-    # consider meaningful if any slot (except booking_reference) present or ref present
-    meaningful = any(v for k,v in slots.items() if k != "booking_reference") or slots["booking_reference"]
-    if meaningful:
+    if _is_meaningful(slots):
         return slots
     if USE_LLM_FOR_SLOTS:
         return llm_extract_slots(user_input)
     return slots
 
-def handle_message(user_text: str) -> Dict[str, Any]:
-    intent = generate_intent(user_text)
-    slots = extract_slots(user_text)
-    assistant_text = ""
+def understand(user_text: str) -> Tuple[str, Dict[str,str]]:
+    """
+    Intent and slots for one message. With LLM_COMBINED_CALL both come from a single
+    LLM call (regex slots still win when they found something, as in extract_slots);
+    if that call fails or its JSON does not parse, fall back to the two-call path.
+    """
+    if LLM_COMBINED_CALL and not USE_MOCK_LLM:
+        with MCP_STAGE_SECONDS.labels("intent").time():
+            intent = local_intent(user_text)
+        if intent is None:
+            with MCP_STAGE_SECONDS.labels("intent_slots").time():
+                combined = llm_intent_and_slots(user_text)
+            if combined is not None:
+                intent, llm_slots = combined
+                slots = regex_slot_extraction(user_text)
+                return intent, (slots if _is_meaningful(slots) else llm_slots)
+            with MCP_STAGE_SECONDS.labels("intent").time():
+                intent = generate_intent(user_text, use_local=False)
+    else:
+        with MCP_STAGE_SECONDS.labels("intent").time():
+            intent = generate_intent(user_text)
+    with MCP_STAGE_SECONDS.labels("slots").time():
+        slots = extract_slots(user_text)
+    return intent, slots
+
+async def understand_async(user_text: str) -> Tuple[str, Dict[str,str]]:
+    """
+    understand() on the async LLM client: when regex finds no slots, the intent and
+    slot calls are issued concurrently instead of one after the other.
+    """
+    intent, use_local = None, True
+    if LLM_COMBINED_CALL and not USE_MOCK_LLM:
+        intent = local_intent(user_text)
+        if intent is None:
+            combined = await llm_intent_and_slots_async(user_text)
+            if combined is not None:
+                intent, llm_slots = combined
+                slots = regex_slot_extraction(user_text)
+                return intent, (slots if _is_meaningful(slots) else llm_slots)
+            use_local = False
+    slots = regex_slot_extraction(user_text)
+    need_llm_slots = USE_LLM_FOR_SLOTS and not _is_meaningful(slots)
+    if intent is not None:
+        return intent, (await llm_extract_slots_async(user_text) if need_llm_slots else slots)
+    if need_llm_slots:
+        intent, slots = await asyncio.gather(generate_intent_async(user_text, use_local), llm_extract_slots_async(user_text))
+        return intent, slots
+    return await generate_intent_async(user_text, use_local), slots
+
+BOOK_REQUIRED = ("passenger_name", "origin", "destination", "date", "time")
+
+# a bare "Asha Rao" answering "I need more info: passenger_name"
+NAME_ONLY_RE = re.compile(r"^[A-Z][a-zA-Z.'-]*(?: [A-Z][a-zA-Z.'-]*){0,3}$")
+# "for Asha Rao", "passenger is Asha Rao", "name: Asha Rao" (name still capitalised)
+NAME_MARKER_RE = re.compile(r"^(?i:(?:it'?s |it is )?for|passenger(?: name)?(?: is)?:?|name(?: is)?:?)\s+"
+                            r"(?P<name>[A-Z][a-zA-Z.'-]*(?: [A-Z][a-zA-Z.'-]*){0,3})$")
+# replies that are never a name, however they are capitalised
+NOT_A_NAME = frozenset("""
+    thanks thank you thx ty yes yeah yep yup no nope nah ok okay k sure fine great cool good perfect
+    done please hi hello hey sorry what why how when where who help cancel book reschedule stop
+""".split())
+
+def _reply_name(user_text: str, pending: Dict[str, Any]) -> str:
+    """
+    The passenger name carried by a follow-up reply, or "". A bare capitalised reply only
+    counts when the name is the one thing the pending booking still lacks; otherwise the
+    reply needs a marker ("for Asha Rao"). Acknowledgements and places are never names.
+    """
+    text = user_text.strip()
+    m = NAME_MARKER_RE.match(text)
+    if m:
+        name = m.group("name")
+    else:
+        missing = [k for k in BOOK_REQUIRED if not pending["slots"].get(k)]
+        if pending["intent"] != "book" or missing != ["passenger_name"] or not NAME_ONLY_RE.match(text):
+            return ""
+        name = text
+    words = name.split()
+    if any(w.lower().strip(".'-") in NOT_A_NAME for w in words):
+        return ""
+    if get_gazetteer().find_places(name) or any(len(w) == 3 and w.isupper() for w in words):
+        return ""
+    return name
+
+def _follow_up(user_text: str, pending: Optional[Dict[str, Any]]) -> Tuple[bool, Dict[str,str]]:
+    """
+    For a turn in a conversation with a pending request: (continues, new_slots). The
+    pending intent is kept unless the message explicitly asks for a different action,
+    and only the new message is scanned. new_slots is empty when nothing was recognised
+    and the LLM slot extractor should look at it.
+    """
+    if not pending:
+        return False, {}
+    explicit = rule_based_intent(user_text)
+    if explicit != "unknown" and explicit != pending["intent"]:
+        return False, {}
+    new = regex_slot_extraction(user_text)
+    if _is_meaningful(new):
+        return True, new
+    if not pending["slots"].get("passenger_name"):
+        name = _reply_name(user_text, pending)
+        if name:
+            return True, dict(new, passenger_name=name)
+    return True, {}
+
+def _merge_slots(old: Dict[str,str], new: Dict[str,str]) -> Dict[str,str]:
+    """
+    Fill the slots the pending request still lacks; what the user already gave is kept.
+    A bare place ("Delhi") is scanned as an origin, so new places go to whichever end of
+    the route is still missing rather than to the role the scanner guessed.
+    """
+    merged = {k: old.get(k) or new.get(k, "") for k in SLOT_KEYS}
+    places = [p for p in (new.get("origin"), new.get("destination"))
+              if p and p not in (merged["origin"], merged["destination"])]
+    for role in ("origin", "destination"):
+        if not merged[role] and places:
+            merged[role] = places.pop(0)
+    return merged
+
+def _continue_pending(user_text: str, session_id: Optional[str]) -> Optional[Tuple[str, Dict[str,str]]]:
+    """(intent, slots) when the message continues the session's pending request, else None."""
+    pending = conversation_store.get(session_id) if session_id else None
+    continues, new = _follow_up(user_text, pending)
+    if not continues:
+        return None
+    if not new and USE_LLM_FOR_SLOTS:
+        with MCP_STAGE_SECONDS.labels("slots").time():
+            new = llm_extract_slots(user_text)
+    return pending["intent"], _merge_slots(pending["slots"], new)
+
+async def _continue_pending_async(user_text: str, session_id: Optional[str]) -> Optional[Tuple[str, Dict[str,str]]]:
+    pending = conversation_store.get(session_id) if session_id else None
+    continues, new = _follow_up(user_text, pending)
+    if not continues:
+        return None
+    if not new and USE_LLM_FOR_SLOTS:
+        with MCP_STAGE_SECONDS.labels("slots").time():
+            new = await llm_extract_slots_async(user_text)
+    return pending["intent"], _merge_slots(pending["slots"], new)
+
+def _remember(session_id: Optional[str], result: Dict[str, Any]):
+    """Keep the request pending while it still needs information, forget it once handled."""
+    if not session_id:
+        return
+    if result["intent"] in TOOLS and not result["tool_output"]:
+        slots = dict(result["slots"])
+        if slots.get("origin") and slots["origin"].upper() == (slots.get("destination") or "").upper():
+            slots["destination"] = ""  # rejected by plan_tool_call; ask for it again
+        conversation_store.set(session_id, {"intent": result["intent"], "slots": slots})
+    else:
+        conversation_store.delete(session_id)
+
+def handle_message(user_text: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    With a session_id, a request that is missing information stays pending and later turns
+    only fill in what they add ("at 10:30"), without another intent call.
+    """
+    with MCP_STAGE_SECONDS.labels("total").time():
+        intent, slots = _continue_pending(user_text, session_id) or understand(user_text)
+        result = route_intent(intent, slots)
+        _remember(session_id, result)
+    MCP_MESSAGES.labels(intent).inc()
+    return result
+
+async def handle_message_async(user_text: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+    with MCP_STAGE_SECONDS.labels("total").time():
+        resumed = await _continue_pending_async(user_text, session_id)
+        if resumed is not None:
+            intent, slots = resumed
+        else:
+            # intent and slot calls may overlap here, so they are timed together
+            with MCP_STAGE_SECONDS.labels("understand").time():
+                intent, slots = await understand_async(user_text)
+        # backend tools are blocking HTTP calls; keep them off the event loop
+        result = await asyncio.to_thread(route_intent, intent, slots)
+        _remember(session_id, result)
+    MCP_MESSAGES.labels(intent).inc()
+    return result
+
+def understand_stream(user_text: str) -> Iterator[Dict[str, Any]]:
+    """
+    understand() as events. With LLM_COMBINED_CALL the combined answer is streamed, so an
+    {"type": "intent"} event can go out before the slots have been generated; the last
+    event is always {"type": "understood", "intent", "slots"}.
+    """
+    if LLM_COMBINED_CALL and not USE_MOCK_LLM:
+        intent = local_intent(user_text)
+        if intent is None:
+            combined = None
+            for kind, value in llm_intent_and_slots_stream(user_text):
+                if kind == "intent":
+                    yield {"type": "intent", "intent": value}
+                else:
+                    combined = value
+            if combined is not None:
+                intent, llm_slots = combined
+                slots = regex_slot_extraction(user_text)
+                yield {"type": "understood", "intent": intent, "slots": slots if _is_meaningful(slots) else llm_slots}
+                return
+            intent = generate_intent(user_text, use_local=False)
+    else:
+        intent = generate_intent(user_text)
+    yield {"type": "intent", "intent": intent}
+    yield {"type": "understood", "intent": intent, "slots": extract_slots(user_text)}
+
+def handle_message_stream(user_text: str, session_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    handle_message as a stream of events for a UI to render while the turn is in progress:
+    status, intent, understood, tool_call (only when the backend is called), text (the reply
+    in word-sized deltas) and finally done, whose "result" is what handle_message returns.
+    """
+    yield {"type": "status", "text": "Understanding your request..."}
+    resumed = _continue_pending(user_text, session_id)
+    if resumed is not None:
+        intent, slots = resumed
+        yield {"type": "intent", "intent": intent}
+    else:
+        for event in understand_stream(user_text):
+            if event["type"] == "understood":
+                intent, slots = event["intent"], event["slots"]
+            else:
+                yield event
+    yield {"type": "understood", "intent": intent, "slots": slots}
+
+    tool, arg, assistant_text = plan_tool_call(intent, slots)
     tool_output = {}
+    if tool is not None:
+        yield {"type": "tool_call", "tool": tool}
+        with MCP_STAGE_SECONDS.labels("tool").time():
+            tool_output = TOOLS[tool](arg)
+        assistant_text = render_tool_result(tool, tool_output)
+    for delta in re.findall(r"\S+\s*", assistant_text):
+        yield {"type": "text", "delta": delta}
+    result = {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
+    _remember(session_id, result)
+    MCP_MESSAGES.labels(intent).inc()
+    yield {"type": "done", "result": result}
 
+def plan_tool_call(intent: str, slots: Dict[str,str]) -> Tuple[Optional[str], Any, str]:
+    """
+    What a message needs from the backend: (tool, argument, "") for a book/cancel/reschedule
+    call, or (None, None, assistant_text) when it can be answered without one.
+    """
     if intent == "book":
-        missing = [k for k in ["passenger_name","origin","destination","date","time"] if not slots.get(k)]
+        missing = [k for k in BOOK_REQUIRED if not slots.get(k)]
         if missing:
-            assistant_text = ("I detected you want to book a flight, but I need more info: " +
-                              ", ".join(missing) +
-                              ". Example: 'Book flight for Vaishak from BOM to BLR on 2025-10-10 at 10:30'.")
-            return {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
-
+            return None, None, ("I detected you want to book a flight, but I need more info: " +
+                                ", ".join(missing) +
+                                ". Example: 'Book flight for Vaishak from BOM to BLR on 2025-10-10 at 10:30'.")
+        if slots["origin"].upper() == slots["destination"].upper():
+            return None, None, (f"The origin and destination are both {slots['origin']}. "
+                                "Where would you like to fly to?")
         payload = {
             "passenger_name": slots.get("passenger_name"),
             "origin": slots.get("origin"),
@@ -119,46 +307,125 @@ def handle_message(user_text: str) -> Dict[str, Any]:
             "time": slots.get("time"),
             "flight_class": "Economy"
         }
-        tool_output = book_tool(payload)
-        if "error" in tool_output:
-            assistant_text = f"Failed to create booking: {tool_output['error']}"
-        else:
-            assistant_text = (f"Booking confirmed. Reference: {tool_output.get('booking_reference')}. "
-                              f"{tool_output.get('origin')} -> {tool_output.get('destination')} on {tool_output.get('date')} at {tool_output.get('time')}.")
-        return {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
+        return "book", payload, ""
 
     elif intent == "cancel":
         br = slots.get("booking_reference")
         if not br:
-            assistant_text = "I detected a cancel intent but could not find a booking reference. Please provide your booking reference (e.g., BK-20250928-xxxx)."
-            return {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
-        tool_output = cancel_tool(br)
-        if "error" in tool_output:
-            assistant_text = f"Failed to cancel booking: {tool_output['error']}"
-        else:
-            assistant_text = f"Booking {tool_output.get('booking_reference')} has been cancelled."
-        return {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
+            return None, None, "I detected a cancel intent but could not find a booking reference. Please provide your booking reference (e.g., BK-01K7QW3F5C8V9R2M6N4T1XZ0AB)."
+        return "cancel", br, ""
 
     elif intent == "reschedule":
         br = slots.get("booking_reference")
         if not br:
-            assistant_text = "I detected a reschedule request but could not find a booking reference. Please give me your booking reference and the new date/time."
-            return {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
+            return None, None, "I detected a reschedule request but could not find a booking reference. Please give me your booking reference and the new date/time."
         if not slots.get("date") or not slots.get("time"):
-            assistant_text = "Please provide the new date and time for your booking (YYYY-MM-DD and HH:MM)."
-            return {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
+            return None, None, "Please provide the new date and time for your booking (YYYY-MM-DD and HH:MM)."
+        return "reschedule", {"booking_reference": br, "new_date": slots.get("date"), "new_time": slots.get("time")}, ""
+
+    return None, None, "Sorry — I didn't understand that. I can help with booking, cancelling, or rescheduling flights."
 
-        payload = {"booking_reference": br, "new_date": slots.get("date"), "new_time": slots.get("time")}
-        tool_output = reschedule_tool(payload)
+def render_tool_result(tool: str, tool_output: Dict[str, Any]) -> str:
+    if tool == "book":
         if "error" in tool_output:
-            assistant_text = f"Failed to reschedule booking: {tool_output['error']}"
-        else:
-            assistant_text = (f"Booking {tool_output.get('booking_reference')} rescheduled to {tool_output.get('date')} at {tool_output.get('time')}.")
-        return {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
+            return f"Failed to create booking: {tool_output['error']}"
+        return (f"Booking confirmed. Reference: {tool_output.get('booking_reference')}. "
+                f"{tool_output.get('origin')} -> {tool_output.get('destination')} on {tool_output.get('date')} at {tool_output.get('time')}.")
+    if tool == "cancel":
+        if "error" in tool_output:
+            return f"Failed to cancel booking: {tool_output['error']}"
+        return f"Booking {tool_output.get('booking_reference')} has been cancelled."
+    if "error" in tool_output:
+        return f"Failed to reschedule booking: {tool_output['error']}"
+    return f"Booking {tool_output.get('booking_reference')} rescheduled to {tool_output.get('date')} at {tool_output.get('time')}."
 
-    else:
-        assistant_text = "Sorry — I didn't understand that. I can help with booking, cancelling, or rescheduling flights."
-        return {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
+TOOLS = {"book": book_tool, "cancel": cancel_tool, "reschedule": reschedule_tool}
+
+def route_intent(intent: str, slots: Dict[str,str]) -> Dict[str, Any]:
+    tool, arg, assistant_text = plan_tool_call(intent, slots)
+    tool_output = {}
+    if tool is not None:
+        with MCP_STAGE_SECONDS.labels("tool").time():
+            tool_output = TOOLS[tool](arg)
+        assistant_text = render_tool_result(tool, tool_output)
+    return {"assistant_text": assistant_text, "tool_output": tool_output, "intent": intent, "slots": slots}
+
+# ----------------- BATCH -----------------
+BULK_TOOLS = {"book": bulk_book_tool, "cancel": bulk_cancel_tool, "reschedule": bulk_reschedule_tool}
+
+def _bulk_rounds(calls: List[Tuple[int, str, Any]]) -> List[Tuple[str, List[Tuple[int, Any]]]]:
+    """
+    Group (index, tool, arg) calls, in input order, into bulk requests of at most
+    MCP_BULK_CHUNK items, as a list of (tool, chunk) to run one after the other. The k-th
+    message about a booking reference goes into round k whatever its tool, so messages
+    about one booking run in input order (cancel then reschedule stays that way), and a
+    reference appears at most once per round (the bulk endpoints reject repeats).
+    New bookings name no existing reference and all go into the first round.
+    """
+    seen: Dict[str, int] = defaultdict(int)
+    rounds: List[Dict[str, List[Tuple[int, Any]]]] = []
+    for i, tool, arg in calls:
+        k = 0
+        if tool != "book":
+            ref = arg if tool == "cancel" else arg["booking_reference"]
+            k = seen[ref]
+            seen[ref] += 1
+        while len(rounds) <= k:
+            rounds.append(defaultdict(list))
+        rounds[k][tool].append((i, arg))
+    return [(tool, items[j:j + MCP_BULK_CHUNK])
+            for r in rounds for tool, items in r.items() for j in range(0, len(items), MCP_BULK_CHUNK)]
+
+def _run_bulk(tool: str, chunk: List[Tuple[int, Any]]) -> Dict[int, Dict[str, Any]]:
+    bulk_key = uuid.uuid4().hex
+    response = BULK_TOOLS[tool]([arg for _, arg in chunk], idempotency_key=bulk_key)
+    if "error" in response:
+        status = response.get("status_code") or 0
+        if not 400 <= status < 500:
+            # timeout or 5xx after the transport's retries: the batch may have committed,
+            # so sending the items again could book or cancel twice
+            return {i: {"error": response["error"]} for i, _ in chunk}
+        # the whole request was rejected (e.g. a version conflict) and nothing was written;
+        # fall back to one call per item, keyed from the batch so a replay is deduplicated
+        return {i: TOOLS[tool](arg, idempotency_key=f"{bulk_key}-{n}") for n, (i, arg) in enumerate(chunk)}
+    out = {}
+    for (i, _), result in zip(chunk, response["results"]):
+        out[i] = result["booking"] if result["ok"] else {"error": result["error"]}
+    return out
+
+async def handle_messages_async(messages: List[str], concurrency: int = MCP_BATCH_CONCURRENCY) -> List[Dict[str, Any]]:
+    """
+    Many messages at once. Each distinct text is understood once, at most `concurrency`
+    at a time (identical LLM prompts in flight are shared by llm_adapter), and the backend
+    calls are grouped into bulk requests. Results are in input order.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+    async def understand_one(text: str):
+        async with sem:
+            return await understand_async(text)
+    unique = list(dict.fromkeys(messages))
+    understood = dict(zip(unique, await asyncio.gather(*(understand_one(t) for t in unique))))
+
+    results: List[Dict[str, Any]] = []
+    calls: List[Tuple[int, str, Any]] = []
+    for i, text in enumerate(messages):
+        intent, slots = understood[text]
+        slots = dict(slots)  # duplicates must not share one dict
+        tool, arg, assistant_text = plan_tool_call(intent, slots)
+        results.append({"assistant_text": assistant_text, "tool_output": {}, "intent": intent, "slots": slots})
+        if tool is not None:
+            calls.append((i, tool, arg))
+
+    for tool, chunk in _bulk_rounds(calls):
+        # blocking HTTP / DB work stays off the event loop
+        for i, tool_output in (await asyncio.to_thread(_run_bulk, tool, chunk)).items():
+            results[i]["tool_output"] = tool_output
+            results[i]["assistant_text"] = render_tool_result(tool, tool_output)
+    return results
+
+def handle_messages(messages: List[str], concurrency: int = MCP_BATCH_CONCURRENCY) -> List[Dict[str, Any]]:
+    """Synchronous entry point for handle_messages_async (transcript replays, bulk imports)."""
+    return asyncio.run(handle_messages_async(messages, concurrency))
 
 
 if __name__ == "__main__":
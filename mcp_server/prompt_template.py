@@ -60,3 +60,32 @@ User message:
 
 Respond with the JSON object only.
 """
+
+
+# One call instead of INTENT_PROMPT + SLOT_PROMPT (LLM_COMBINED_CALL=true)
+COMBINED_PROMPT = """
+You are a flight booking assistant. Classify the user's message and extract its flight details.
+
+Return **only one JSON object** with exactly these keys:
+- intent: one of "book", "cancel", "reschedule", "unknown"
+- passenger_name: string ("" if unknown)
+- origin: string (IATA code like "BOM" or city name; "" if unknown)
+- destination: string (IATA code like "BLR" or city name; "" if unknown)
+- date: string (format "YYYY-MM-DD"; "" if unknown)
+- time: string (format "HH:MM"; "" if unknown)
+- booking_reference: string ("" if not provided)
+
+Rules:
+1. "change", "modify", "reschedule" → reschedule; "cancel", "remove", "delete reservation" → cancel; "book", "reserve", "schedule" → book; anything else → unknown.
+2. Output valid JSON only, no explanations or extra text.
+3. Do not hallucinate—if unsure, use "".
+
+Example:
+Input: "Reschedule BK-01K7QW3F5C8V9R2M6N4T1XZ0AB to 2025-10-12 08:00"
+Output: {{"intent":"reschedule","passenger_name":"","origin":"","destination":"","date":"2025-10-12","time":"08:00","booking_reference":"BK-01K7QW3F5C8V9R2M6N4T1XZ0AB"}}
+
+User message:
+\"\"\"{user_input}\"\"\"
+
+Respond with the JSON object only.
+"""
@@ -0,0 +1,91 @@
+# service.py
+"""
+The MCP layer as its own HTTP service, so NLU / LLM work scales apart from the UI.
+
+    python -m mcp_server.service                     # 127.0.0.1:8200, MCP_SERVICE_WORKERS processes
+    uvicorn mcp_server.service:app --workers 4       # equivalent
+
+Conversation state lives in conversation_store; with more than one worker (or several
+hosts behind a load balancer) set CONVERSATION_STORE_URL so any worker can continue it.
+"""
+import os
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from common import metrics
+from . import llm_client
+from .mcp import handle_message_async, handle_messages_async, handle_message_stream, MCP_BATCH_CONCURRENCY
+
+MCP_SERVICE_HOST = os.getenv("MCP_SERVICE_HOST", "127.0.0.1")
+MCP_SERVICE_PORT = int(os.getenv("MCP_SERVICE_PORT", "8200"))
+MCP_SERVICE_WORKERS = int(os.getenv("MCP_SERVICE_WORKERS", "1"))
+# upper bound for a batch request, to keep one client from monopolising a worker
+MCP_SERVICE_MAX_BATCH = int(os.getenv("MCP_SERVICE_MAX_BATCH", "10000"))
+
+
+class MessageRequest(BaseModel):
+    message: str
+    session_id: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    messages: List[str]
+    concurrency: Optional[int] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await llm_client.aclose_async_client()
+
+
+app = FastAPI(title="MCP Service", lifespan=lifespan)
+
+
+# METRICS_ENABLED: request latency per endpoint plus the MCP stage and LLM metrics, on /metrics
+if metrics.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware, prefix="/mcp")
+
+    @app.get("/metrics", include_in_schema=False)
+    def scrape_metrics():
+        return metrics.metrics_response()
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.post("/mcp/message")
+async def message(req: MessageRequest) -> Dict[str, Any]:
+    return await handle_message_async(req.message, session_id=req.session_id)
+
+
+@app.post("/mcp/messages")
+async def messages(req: BatchRequest):
+    if len(req.messages) > MCP_SERVICE_MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MCP_SERVICE_MAX_BATCH} messages per request")
+    results = await handle_messages_async(req.messages, req.concurrency or MCP_BATCH_CONCURRENCY)
+    return {"results": results}
+
+
+@app.post("/mcp/stream")
+def stream(req: MessageRequest):
+    # handle_message_stream is a blocking generator; Starlette iterates it in its threadpool
+    def events():
+        for event in handle_message_stream(req.message, session_id=req.session_id):
+            yield f"data: {json.dumps(event, default=str)}\n\n"
+        yield "data: [DONE]\n\n"
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("mcp_server.service:app", host=MCP_SERVICE_HOST, port=MCP_SERVICE_PORT,
+                workers=MCP_SERVICE_WORKERS, log_level="warning")
@@ -0,0 +1,89 @@
+# slot_scanner.py
+import re
+from typing import Dict, List, Tuple
+
+from .gazetteer import get_gazetteer
+
+BK_REF_RE = re.compile(r"\b(BK[-_]?\w+(?:-\w+)*)\b", re.I)
+
+# Every slot candidate in one left-to-right scan instead of one regex search per slot.
+# Earlier alternatives win at a given position, so a booking reference or date is
+# consumed whole and its pieces are never re-read as words or times.
+SCANNER_RE = re.compile(
+    r"(?P<ref>\bBK[-_]?\w+(?:-\w+)*\b)"
+    r"|(?P<date>(?P<y1>\d{4})-(?P<m1>\d{2})-(?P<d1>\d{2})"
+    r"|(?P<d2>\d{1,2})(?P<sep>[-/])(?P<m2>\d{1,2})(?P=sep)(?P<y2>\d{4}))"
+    r"|(?P<time>(?P<hh>\d{1,2}):(?P<mm>\d{2})(?P<ss>:\d{2})?(?:\s*(?P<ampm>am|pm)\b)?)"
+    # the name is captured in a lookahead so its words (and any place after it) are still scanned
+    r"|(?:name is|this is|i am|passenger is)\s+(?=(?P<name>[A-Z][a-zA-Z\s]{1,40}))"
+    r"|(?P<word>\b[A-Za-z]+\b)",
+    re.I,
+)
+# only for places the gazetteer does not know, when "from" was seen
+FROM_TO_RE = re.compile(r"from\s+([A-Za-z0-9\s,]+?)\s+(?:to|->|-)\s+([A-Za-z0-9\s,]+)", re.I)
+
+_DAYS_IN_MONTH = (31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _date(m: "re.Match") -> str:
+    if m.group("y1"):
+        return m.group("date")  # already YYYY-MM-DD
+    y, mo, d = int(m.group("y2")), int(m.group("m2")), int(m.group("d2"))
+    leap = y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+    if 1 <= mo <= 12 and 1 <= d <= (_DAYS_IN_MONTH[mo - 1] if mo != 2 or leap else 28) and y >= 1:
+        return f"{y:04d}-{mo:02d}-{d:02d}"
+    return m.group("date")
+
+
+def _time(m: "re.Match") -> str:
+    hh, mm, ampm = int(m.group("hh")), int(m.group("mm")), m.group("ampm")
+    if not ampm:
+        return f"{hh:02d}:{mm:02d}"
+    if m.group("ss") or not (1 <= hh <= 12 and mm <= 59):
+        return m.group("time")
+    hh = hh % 12 + (12 if ampm.lower() == "pm" else 0)
+    return f"{hh:02d}:{mm:02d}"
+
+
+def scan_slots(user_input: str) -> Dict[str, str]:
+    """
+    All six slots from one pass over the message: first reference, name, date and time,
+    plus origin/destination resolved through the gazetteer from the same word tokens.
+    """
+    ui = user_input.strip()
+    slots = {"passenger_name": "", "origin": "", "destination": "", "date": "", "time": "", "booking_reference": ""}
+    words: List[Tuple[str, int, int]] = []
+    for m in SCANNER_RE.finditer(ui):
+        kind = m.lastgroup
+        if kind == "word":
+            words.append((m.group(), m.start(), m.end()))
+        elif kind == "ref":
+            if not slots["booking_reference"]:
+                slots["booking_reference"] = m.group()
+        elif kind == "name":
+            if not slots["passenger_name"]:
+                slots["passenger_name"] = m.group("name").strip()
+        elif kind == "date":
+            if not slots["date"]:
+                slots["date"] = _date(m)
+        elif kind == "time":
+            if not slots["time"]:
+                slots["time"] = _time(m)
+
+    origin, dest = get_gazetteer().resolve_route_in_words(words)
+    if not (origin and dest):
+        codes = [w for w, _, _ in words if len(w) == 3 and w.isupper()]
+        if len(codes) >= 2:
+            origin, dest = origin or codes[0], dest or codes[1]
+        elif any(w.lower() == "from" for w, _, _ in words):
+            m = FROM_TO_RE.search(ui)
+            if m:
+                origin = origin or m.group(1).strip().split(",")[0].strip()
+                dest = dest or m.group(2).strip().split(",")[0].strip()
+    slots["origin"], slots["destination"] = origin, dest
+    return slots
+
+
+def scan_slots_batch(messages: List[str]) -> List[Dict[str, str]]:
+    """scan_slots over many messages; results are in input order."""
+    return [scan_slots(m) for m in messages]
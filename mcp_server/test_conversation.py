@@ -0,0 +1,79 @@
+# test_conversation.py
+# Multi-turn follow-ups on the mock LLM and mock backend:
+#     python -m pytest mcp_server/test_conversation.py
+import os
+
+os.environ.setdefault("USE_MOCK_LLM", "true")
+os.environ.setdefault("MOCK_BACKEND", "true")
+os.environ.setdefault("TOOLS_TRANSPORT", "http")
+
+from mcp_server.mcp import handle_message
+from mcp_server.conversation import conversation_store
+
+
+def test_bare_place_fills_the_missing_destination():
+    sid = "test-bare-place"
+    conversation_store.delete(sid)
+    first = handle_message("Book a flight from BOM on 2025-10-10 at 10:30, my name is Asha", sid)
+    assert not first["tool_output"] and first["slots"]["origin"] == "BOM"
+
+    second = handle_message("Delhi", sid)
+    assert second["slots"]["origin"] == "BOM"
+    assert second["slots"]["destination"] == "DEL"
+    assert second["tool_output"]["origin"] == "BOM" and second["tool_output"]["destination"] == "DEL"
+    assert conversation_store.get(sid) is None
+
+
+def test_follow_up_does_not_overwrite_given_slots():
+    sid = "test-no-overwrite"
+    conversation_store.delete(sid)
+    handle_message("Book a flight from BOM on 2025-10-10 at 10:30", sid)
+    second = handle_message("to Delhi", sid)
+    assert (second["slots"]["origin"], second["slots"]["destination"]) == ("BOM", "DEL")
+    assert not second["tool_output"]  # still missing the passenger name
+
+    third = handle_message("Asha Rao", sid)
+    assert third["tool_output"]["origin"] == "BOM" and third["tool_output"]["destination"] == "DEL"
+
+
+def test_same_origin_and_destination_is_not_booked():
+    sid = "test-same-route"
+    conversation_store.delete(sid)
+    first = handle_message("Book a flight from DEL to DEL on 2025-10-10 at 10:30, my name is Asha", sid)
+    assert not first["tool_output"]
+    assert "Where would you like to fly to" in first["assistant_text"]
+
+    second = handle_message("to BOM", sid)
+    assert second["tool_output"]["origin"] == "DEL" and second["tool_output"]["destination"] == "BOM"
+
+
+def test_acknowledgement_is_not_a_name():
+    sid = "test-thanks"
+    conversation_store.delete(sid)
+    handle_message("Book a flight from BOM to DEL on 2025-10-10 at 10:30", sid)
+    for reply in ("Thanks", "Yes", "Ok", "No"):
+        out = handle_message(reply, sid)
+        assert not out["tool_output"] and not out["slots"]["passenger_name"], reply
+    assert conversation_store.get(sid)["slots"]["passenger_name"] == ""
+
+
+def test_bare_reply_is_not_a_name_while_other_slots_are_missing():
+    sid = "test-bare-reply"
+    conversation_store.delete(sid)
+    handle_message("Book a flight from BOM on 2025-10-10 at 10:30", sid)
+    out = handle_message("Shimla", sid)
+    assert not out["tool_output"] and not out["slots"]["passenger_name"]
+
+    out = handle_message("for Asha Rao", sid)
+    assert out["slots"]["passenger_name"] == "Asha Rao" and not out["tool_output"]  # destination still missing
+
+
+def test_place_is_not_a_name():
+    sid = "test-place-name"
+    conversation_store.delete(sid)
+    handle_message("Book a flight from BOM to DEL on 2025-10-10 at 10:30", sid)
+    for reply in ("Goa", "Mumbai", "for MAA"):
+        out = handle_message(reply, sid)
+        assert not out["slots"]["passenger_name"], reply
+    out = handle_message("Asha Rao", sid)
+    assert out["tool_output"]["passenger_name"] == "Asha Rao"
@@ -1,17 +1,26 @@
 import os
+import time
 import requests
-from typing import Dict
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional
 import uuid
 
+from common.refs import new_booking_reference
+
 BASE_URL = os.getenv("BACKEND_URL", "http://127.0.0.1:8000/flight-reservation")
 TIMEOUT = 15
 MOCK_BACKEND = os.getenv("MOCK_BACKEND", "true").lower() in ("1", "true", "yes")
+# timeouts, dropped connections, 5xx and "still in progress" answers are retried under the same Idempotency-Key
+TOOL_RETRIES = int(os.getenv("TOOL_RETRIES", "2"))
+RETRY_BACKOFF = 0.5  # seconds, doubled per attempt
+# "http": keep-alive session to BACKEND_URL; "inprocess": call backend.app.api.bookings directly
+# (MCP and backend in one process, no HTTP hop or JSON round trip)
+TOOLS_TRANSPORT = os.getenv("TOOLS_TRANSPORT", "http").lower()
+TOOLS_POOL_SIZE = int(os.getenv("TOOLS_POOL_SIZE", "20"))
 
 def _mock_booking_response(payload: Dict) -> Dict:
-    booking_reference = f"BK-{datetime.now().strftime('%Y%m%d')}-{str(uuid.uuid4())[:8]}"
     return {
-        "booking_reference": booking_reference,
+        "booking_reference": new_booking_reference(),
         "status": "CONFIRMED",
         "passenger_name": payload.get("passenger_name"),
         "origin": payload.get("origin"),
@@ -20,28 +29,124 @@ def _mock_booking_response(payload: Dict) -> Dict:
         "time": payload.get("time"),
     }
 
-def book_tool(payload: Dict) -> Dict:
+class HttpTransport:
+    """Backend over HTTP through one pooled keep-alive requests.Session."""
+
+    def __init__(self, base_url: str = BASE_URL, pool_size: int = TOOLS_POOL_SIZE):
+        self.base_url = base_url
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(self, path: str, payload, idempotency_key: Optional[str] = None) -> Dict:
+        """
+        POST to the backend with an Idempotency-Key (generated unless given) and retry transient
+        failures under that same key: a retry of a write the backend already applied gets the
+        stored response back instead of writing again.
+        """
+        headers = {"Idempotency-Key": idempotency_key or uuid.uuid4().hex}
+        for attempt in range(TOOL_RETRIES + 1):
+            last_attempt = attempt == TOOL_RETRIES
+            try:
+                r = self.session.post(f"{self.base_url}/{path}", json=payload, headers=headers, timeout=TIMEOUT)
+                retryable = r.status_code >= 500 or (r.status_code == 409 and "Retry-After" in r.headers)
+                if retryable and not last_attempt:
+                    time.sleep(RETRY_BACKOFF * 2 ** attempt)
+                    continue
+                r.raise_for_status()
+                return r.json()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
+                    return {"error": str(e)}
+                time.sleep(RETRY_BACKOFF * 2 ** attempt)
+            except requests.HTTPError as e:
+                # the status tells callers whether the request was rejected outright (4xx)
+                return {"error": str(e), "status_code": e.response.status_code}
+            except Exception as e:
+                return {"error": str(e)}
+
+    def get(self, path: str) -> Dict:
+        try:
+            r = self.session.get(f"{self.base_url}/{path}", timeout=TIMEOUT)
+            r.raise_for_status()
+            return r.json()
+        except Exception as e:
+            return {"error": str(e)}
+
+
+class InProcessTransport:
+    """
+    Calls the backend endpoint functions directly with a fresh DB session per call.
+    Payloads are still validated through the backend schemas; responses are the same
+    JSON-shaped dicts the HTTP transport returns.
+    """
+
+    def __init__(self):
+        from fastapi.encoders import jsonable_encoder
+        from backend.app import db, schemas
+        from backend.app.api import bookings
+
+        self._encode = jsonable_encoder
+        self._session_factory = db.SessionLocal
+        self._bookings = bookings
+        # path -> (endpoint, request schema, body is a list)
+        self._routes = {
+            "book-flight": (bookings.book_flight, schemas.BookingCreate, False),
+            "cancel-flight": (bookings.cancel_flight, schemas.CancelRequest, False),
+            "reschedule-flight": (bookings.reschedule_flight, schemas.RescheduleRequest, False),
+            "bulk/book-flight": (bookings.bulk_book_flight, schemas.BookingCreate, True),
+            "bulk/cancel-flight": (bookings.bulk_cancel_flight, schemas.CancelRequest, True),
+            "bulk/reschedule-flight": (bookings.bulk_reschedule_flight, schemas.RescheduleRequest, True),
+        }
+
+    def _call(self, fn) -> Dict:
+        from fastapi import HTTPException
+
+        try:
+            with self._session_factory() as session:
+                return self._encode(fn(session))
+        except HTTPException as e:
+            return {"error": f"{e.status_code}: {e.detail}", "status_code": e.status_code}
+        except Exception as e:
+            return {"error": str(e)}
+
+    def post(self, path: str, payload, idempotency_key: Optional[str] = None) -> Dict:
+        endpoint, schema, many = self._routes[path]
+        def call(session):
+            body = [schema(**p) for p in payload] if many else schema(**payload)
+            return endpoint(body, idempotency_key=idempotency_key, db=session)
+        return self._call(call)
+
+    def get(self, path: str) -> Dict:
+        prefix = "bookings/"
+        if not path.startswith(prefix):
+            return {"error": f"unsupported in-process path: {path}"}
+        return self._call(lambda session: self._bookings.get_booking(path[len(prefix):], db=session))
+
+
+_transport = None
+
+def get_transport():
+    global _transport
+    if _transport is None:
+        _transport = InProcessTransport() if TOOLS_TRANSPORT == "inprocess" else HttpTransport()
+    return _transport
+
+def _post(path: str, payload, idempotency_key: Optional[str] = None) -> Dict:
+    return get_transport().post(path, payload, idempotency_key)
+
+def book_tool(payload: Dict, idempotency_key: Optional[str] = None) -> Dict:
     if MOCK_BACKEND:
         return _mock_booking_response(payload)
-    try:
-        r = requests.post(f"{BASE_URL}/book-flight", json=payload, timeout=TIMEOUT)
-        r.raise_for_status()
-        return r.json()
-    except Exception as e:
-        return {"error": str(e)}
-
-def cancel_tool(booking_reference: str) -> Dict:
+    return _post("book-flight", payload, idempotency_key)
+
+def cancel_tool(booking_reference: str, idempotency_key: Optional[str] = None) -> Dict:
     if MOCK_BACKEND:
         return {"booking_reference": booking_reference, "status": "CANCELLED"}
-    try:
-        payload = {"booking_reference": booking_reference}
-        r = requests.post(f"{BASE_URL}/cancel-flight", json=payload, timeout=TIMEOUT)
-        r.raise_for_status()
-        return r.json()
-    except Exception as e:
-        return {"error": str(e)}
-
-def reschedule_tool(payload: Dict) -> Dict:
+    return _post("cancel-flight", {"booking_reference": booking_reference}, idempotency_key)
+
+def reschedule_tool(payload: Dict, idempotency_key: Optional[str] = None) -> Dict:
     if MOCK_BACKEND:
         return {
             "booking_reference": payload.get("booking_reference"),
@@ -49,9 +154,39 @@ def reschedule_tool(payload: Dict) -> Dict:
             "date": payload.get("new_date"),
             "time": payload.get("new_time"),
         }
-    try:
-        r = requests.post(f"{BASE_URL}/reschedule-flight", json=payload, timeout=TIMEOUT)
-        r.raise_for_status()
-        return r.json()
-    except Exception as e:
-        return {"error": str(e)}
+    return _post("reschedule-flight", payload, idempotency_key)
+
+def get_booking_tool(booking_reference: str) -> Dict:
+    """Look up a booking by reference (served from the backend's booking cache when warm)."""
+    if MOCK_BACKEND:
+        return {"booking_reference": booking_reference, "status": "CONFIRMED"}
+    return get_transport().get(f"bookings/{booking_reference}")
+
+# ----------------- BULK -----------------
+def _mock_bulk_response(bookings: List[Dict]) -> Dict:
+    results = [{"index": i, "ok": True, "booking": b, "error": None} for i, b in enumerate(bookings)]
+    return {"succeeded": len(results), "failed": 0, "results": results}
+
+def bulk_book_tool(payloads: List[Dict], idempotency_key: Optional[str] = None) -> Dict:
+    """Book many flights in one backend transaction; results[i] matches payloads[i]."""
+    if MOCK_BACKEND:
+        return _mock_bulk_response([_mock_booking_response(p) for p in payloads])
+    return _post("bulk/book-flight", payloads, idempotency_key)
+
+def bulk_cancel_tool(booking_references: List[str], idempotency_key: Optional[str] = None) -> Dict:
+    if MOCK_BACKEND:
+        return _mock_bulk_response([{"booking_reference": br, "status": "CANCELLED"} for br in booking_references])
+    return _post("bulk/cancel-flight", [{"booking_reference": br} for br in booking_references], idempotency_key)
+
+def bulk_reschedule_tool(payloads: List[Dict], idempotency_key: Optional[str] = None) -> Dict:
+    if MOCK_BACKEND:
+        return _mock_bulk_response([
+            {
+                "booking_reference": p.get("booking_reference"),
+                "status": "RESCHEDULED",
+                "date": p.get("new_date"),
+                "time": p.get("new_time"),
+            }
+            for p in payloads
+        ])
+    return _post("bulk/reschedule-flight", payloads, idempotency_key)
@@ -0,0 +1,331 @@
+"""
+Load benchmark for the /flight-reservation booking endpoints.
+
+Starts the backend with uvicorn against a fresh SQLite file (or --database-url, e.g. a
+Postgres-compatible server), preloads bookings, then drives a concurrent, seeded mix of
+book / cancel / reschedule requests over pooled keep-alive connections and reports
+throughput and p50/p95/p99 latency per operation. Results are written as JSON so
+releases can be compared with --compare.
+
+    python scripts/bench_backend.py [--requests 5000] [--concurrency 16] [--mix book=50,cancel=20,reschedule=30]
+    python scripts/bench_backend.py --database-url postgresql://bench@localhost/bench --reset
+    python scripts/bench_backend.py --url http://127.0.0.1:8000 ...     # an already-running backend
+    python scripts/bench_backend.py --compare bench-baseline.json        # exit 1 on a regression
+
+Server settings come from the environment as usual (DB_PROFILE, USE_ASYNC_DB, GROUP_COMMIT, ...);
+DB_PROFILE defaults to production so statement echo does not dominate the numbers.
+"""
+import os
+import sys
+import json
+import math
+import time
+import socket
+import random
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import Counter, defaultdict
+from datetime import date, timedelta, datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+PREFIX = "/flight-reservation"
+OPERATIONS = ("book", "cancel", "reschedule")
+AIRPORTS = ["BOM", "BLR", "DEL", "MAA", "CCU", "HYD", "GOI", "PNQ", "AMD", "COK"]
+TIMES = ["06:00", "10:30", "15:45", "20:15"]
+NAMES = ["Asha Rao", "John Doe", "Priya Nair", "Rahul Mehta", "Neha Gupta", "Vaishak S"]
+FIRST_DAY = date(2030, 1, 1)  # fixed so runs (and their inventory) are reproducible
+
+
+# ----------------- SETUP -----------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def departures(routes: int, days: int):
+    """(origin, destination, date, time) for every inventoried departure."""
+    pairs = [(a, b) for a in AIRPORTS for b in AIRPORTS if a != b][:routes]
+    return [(a, b, FIRST_DAY + timedelta(days=d), t) for a, b in pairs for d in range(days) for t in TIMES]
+
+
+def prepare_database(url: str, reset: bool, deps, capacity: int):
+    """Create the schema and one flight row per departure. Runs before the server starts."""
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("DB_PROFILE", "production")
+    from sqlalchemy import insert, select, func
+    from backend.app.db import Base, engine
+    from backend.app import models
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(models.Flight)).scalar():
+            return  # inventory from an earlier run is kept
+        conn.execute(insert(models.Flight), [
+            {"origin": a, "destination": b, "date": d, "time": datetime.strptime(t, "%H:%M").time(),
+             "flight_class": "Economy", "capacity": capacity, "seats_available": capacity}
+            for a, b, d, t in deps
+        ])
+    engine.dispose()
+
+
+def start_server(url: str, port: int, workers: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=url)
+    env.setdefault("DB_PROFILE", "production")
+    cmd = [sys.executable, "-m", "uvicorn", "backend.app.main:app", "--host", "127.0.0.1", "--port", str(port),
+           "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(cmd, cwd=ROOT, env=env)
+
+
+def wait_ready(base_url: str, server: subprocess.Popen = None, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise SystemExit(f"backend exited with status {server.returncode}")
+        try:
+            if requests.get(base_url + "/openapi.json", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"backend at {base_url} not ready after {timeout:.0f}s")
+
+
+# ----------------- WORKLOAD -----------------
+class Workload:
+    """
+    Seeded request generator. Bookings made during the run join the pool of live
+    references that cancels and reschedules draw from, so all three keep hitting real rows.
+    """
+
+    def __init__(self, deps, mix, seed: int):
+        self.deps = deps
+        self.ops, self.weights = zip(*mix.items())
+        self.rnd = random.Random(seed)
+        self.live = []
+        self.lock = threading.Lock()
+
+    def booking_payload(self, rnd: random.Random) -> dict:
+        a, b, d, t = rnd.choice(self.deps)
+        return {"passenger_name": rnd.choice(NAMES), "origin": a, "destination": b, "date": d.isoformat(), "time": t}
+
+    def next_request(self):
+        """(operation, path, payload) for the next request; cancels fall back to a booking when nothing is live."""
+        with self.lock:
+            op = self.rnd.choices(self.ops, self.weights)[0]
+            if op == "cancel" and self.live:
+                ref = self.live.pop(self.rnd.randrange(len(self.live)))
+                return op, "/cancel-flight", {"booking_reference": ref}
+            if op == "reschedule" and self.live:
+                ref = self.rnd.choice(self.live)
+                _, _, d, t = self.rnd.choice(self.deps)
+                return op, "/reschedule-flight", {"booking_reference": ref, "new_date": d.isoformat(), "new_time": t}
+            return "book", "/book-flight", self.booking_payload(self.rnd)
+
+    def booked(self, ref: str):
+        with self.lock:
+            self.live.append(ref)
+
+
+def preload(base_url: str, workload: Workload, count: int, chunk: int = 500):
+    session = requests.Session()
+    rnd = random.Random(workload.rnd.random())
+    for start in range(0, count, chunk):
+        items = [workload.booking_payload(rnd) for _ in range(min(chunk, count - start))]
+        resp = session.post(base_url + PREFIX + "/bulk/book-flight", json=items, timeout=120)
+        resp.raise_for_status()
+        for result in resp.json()["results"]:
+            if result["ok"]:
+                workload.live.append(result["booking"]["booking_reference"])
+
+
+def run(base_url: str, workload: Workload, total: int, concurrency: int, timeout: float):
+    """Issue `total` requests from `concurrency` threads; returns ({op: [latency_s]}, {op: Counter(status)}, seconds)."""
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    remaining = [total]
+    counter_lock = threading.Lock()
+
+    def worker():
+        session = requests.Session()  # one keep-alive connection per worker
+        lat, st = defaultdict(list), defaultdict(Counter)
+        while True:
+            with counter_lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            op, path, payload = workload.next_request()
+            start = time.perf_counter()
+            try:
+                resp = session.post(base_url + PREFIX + path, json=payload, timeout=timeout)
+                status = resp.status_code
+            except requests.RequestException:
+                resp, status = None, "error"
+            lat[op].append(time.perf_counter() - start)
+            st[op][status] += 1
+            if op == "book" and status == 200:
+                workload.booked(resp.json()["booking_reference"])
+        return lat, st
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for lat, st in pool.map(lambda _: worker(), range(concurrency)):
+            for op in lat:
+                latencies[op].extend(lat[op])
+                statuses[op].update(st[op])
+    return latencies, statuses, time.perf_counter() - start
+
+
+# ----------------- REPORT -----------------
+def percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+def summarize(latencies, statuses, elapsed: float) -> dict:
+    values = sorted(latencies)
+    ok = statuses.get(200, 0)
+    return {
+        "requests": len(values),
+        "ok": ok,
+        "errors": {str(k): v for k, v in sorted(statuses.items(), key=str) if k != 200},
+        "throughput_rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+            "p50": round(percentile(values, 50) * 1000, 3),
+            "p95": round(percentile(values, 95) * 1000, 3),
+            "p99": round(percentile(values, 99) * 1000, 3),
+            "max": round(values[-1] * 1000, 3) if values else 0.0,
+        },
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def print_report(report: dict):
+    print(f"{'operation':>12} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    rows = list(report["operations"].items()) + [("all", report["overall"])]
+    for name, s in rows:
+        lat = s["latency_ms"]
+        print(f"{name:>12} {s['requests']:>9} {sum(s['errors'].values()):>7} {s['throughput_rps']:>9.1f} "
+              f"{lat['p50']:>9.2f} {lat['p95']:>9.2f} {lat['p99']:>9.2f}")
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> bool:
+    """Print the change against a baseline; True when p95 or throughput regressed by more than max_regression %."""
+    regressed = False
+    base_rows = dict(baseline["operations"], all=baseline["overall"])
+    print(f"\nvs {baseline['meta'].get('git_commit') or 'baseline'} ({baseline['meta'].get('timestamp', '')})")
+    for name, s in list(report["operations"].items()) + [("all", report["overall"])]:
+        base = base_rows.get(name)
+        if not base or not base["requests"]:
+            continue
+        p95 = (s["latency_ms"]["p95"] / base["latency_ms"]["p95"] - 1) * 100 if base["latency_ms"]["p95"] else 0.0
+        rps = (s["throughput_rps"] / base["throughput_rps"] - 1) * 100 if base["throughput_rps"] else 0.0
+        flag = p95 > max_regression or -rps > max_regression
+        regressed |= flag
+        print(f"{name:>12}  p95 {p95:+7.1f}%  throughput {rps:+7.1f}%{'  REGRESSION' if flag else ''}")
+    return regressed
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        op, _, weight = part.partition("=")
+        if op.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {op!r} (expected one of {', '.join(OPERATIONS)})")
+        mix[op.strip()] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="benchmark a running backend instead of starting one")
+    parser.add_argument("--database-url", help="database for the started backend (default: a temporary SQLite file)")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate the tables of --database-url first")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the started backend")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=200, help="requests issued before measuring")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("book=50,cancel=20,reschedule=30"))
+    parser.add_argument("--preload", type=int, default=2000, help="bookings created (in bulk) before the run")
+    parser.add_argument("--routes", type=int, default=10)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--capacity", type=int, default=1_000_000, help="seats per inventoried departure")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", default="bench-results.json")
+    parser.add_argument("--compare", help="earlier results file; exit 1 when this run is slower")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="allowed p95/throughput change in %%")
+    args = parser.parse_args()
+
+    deps = departures(args.routes, args.days)
+    server = None
+    database = "external"
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        database = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-'), 'bench.db')}"
+        prepare_database(database, args.reset, deps, args.capacity)
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = start_server(database, port, args.workers)
+    try:
+        wait_ready(base_url, server)
+        workload = Workload(deps, args.mix, args.seed)
+        preload(base_url, workload, args.preload)
+        if args.warmup:
+            run(base_url, workload, args.warmup, args.concurrency, args.timeout)
+        latencies, statuses, elapsed = run(base_url, workload, args.requests, args.concurrency, args.timeout)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    all_latencies = [v for values in latencies.values() for v in values]
+    all_statuses = sum(statuses.values(), Counter())
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": database.partition("://")[0] if database != "external" else database,
+            "server_env": {k: os.environ[k] for k in ("DB_PROFILE", "USE_ASYNC_DB", "GROUP_COMMIT") if k in os.environ},
+            "config": {k: v for k, v in vars(args).items() if k not in ("compare", "output")},
+        },
+        "overall": summarize(all_latencies, all_statuses, elapsed),
+        "operations": {op: summarize(latencies[op], statuses[op], elapsed) for op in OPERATIONS if op in latencies},
+    }
+    print_report(report)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(report, json.load(f), args.max_regression):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Micro-benchmark: single-pass slot scanner vs. the previous sequential-regex extractor.
+
+    python scripts/bench_slot_extraction.py [--messages 100000] [--repeat 3]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mcp_server.gazetteer import get_gazetteer  # noqa: E402
+from mcp_server.slot_scanner import scan_slots, scan_slots_batch  # noqa: E402
+
+# ----------------- BASELINE (previous mcp.regex_slot_extraction) -----------------
+DATE_RE = re.compile(r"(?P<date>\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{4}|\d{1,2}-\d{1,2}-\d{4})")
+TIME_RE = re.compile(r"(?P<time>\d{1,2}:\d{2}(?::\d{2})?\s*(?:am|pm)?)", re.I)
+IATA_RE = re.compile(r"\b([A-Z]{3})\b")
+BK_REF_RE = re.compile(r"\b(BK[-_]?[\w\d]+)\b", re.I)
+FROM_TO_RE = re.compile(r"from\s+([A-Za-z0-9\s,]+?)\s+(?:to|->|-)\s+([A-Za-z0-9\s,]+)", re.I)
+NAME_RE = re.compile(r"(?:name is|this is|i am|passenger is)\s+([A-Z][a-zA-Z\s]{1,40})", re.I)
+
+
+def _normalize_date(found):
+    if not found:
+        return ""
+    found = found.strip()
+    if re.match(r"\d{4}-\d{2}-\d{2}", found):
+        return found
+    parts = re.split(r"[-/]", found)
+    if len(parts) == 3:
+        if len(parts[0]) == 4:
+            y, m, d = parts
+        else:
+            d, m, y = parts
+        try:
+            dt = datetime(int(y), int(m), int(d))
+            return dt.strftime("%Y-%m-%d")
+        except Exception:
+            return found
+    return found
+
+
+def _normalize_time(found):
+    if not found:
+        return ""
+    try:
+        t = found.strip().lower()
+        t = re.sub(r"\s+", "", t)
+        if re.search(r"(am|pm)$", t):
+            dt = datetime.strptime(t, "%I:%M%p")
+            return dt.strftime("%H:%M")
+        if re.match(r"\d{1,2}:\d{2}(:\d{2})?", t):
+            hh, mm = t.split(":")[:2]
+            return f"{int(hh):02d}:{int(mm):02d}"
+    except Exception:
+        return found
+    return found
+
+
+def baseline_slot_extraction(user_input):
+    ui = user_input.strip()
+    slots = {"passenger_name": "", "origin": "", "destination": "", "date": "", "time": "", "booking_reference": ""}
+
+    m = BK_REF_RE.search(ui)
+    if m:
+        slots["booking_reference"] = m.group(1)
+
+    m = NAME_RE.search(ui)
+    if m:
+        slots["passenger_name"] = m.group(1).strip()
+
+    m = DATE_RE.search(ui)
+    if m:
+        slots["date"] = _normalize_date(m.group("date"))
+
+    m = TIME_RE.search(ui)
+    if m:
+        slots["time"] = _normalize_time(m.group("time"))
+
+    origin, dest = get_gazetteer().resolve_route(ui)
+    slots["origin"], slots["destination"] = origin, dest
+    if origin and dest:
+        return slots
+
+    codes = IATA_RE.findall(ui)
+    if len(codes) >= 2:
+        origin, dest = origin or codes[0], dest or codes[1]
+    else:
+        m = FROM_TO_RE.search(ui)
+        if m:
+            origin = origin or m.group(1).strip().split(",")[0].strip()
+            dest = dest or m.group(2).strip().split(",")[0].strip()
+    slots["origin"], slots["destination"] = origin, dest
+
+    return slots
+
+
+# ----------------- CORPUS -----------------
+NAMES = ["Vaishak S", "Asha Rao", "John Doe", "Priya Nair", "Rahul Mehta", "Neha Gupta"]
+PLACES = ["BOM", "BLR", "DEL", "MAA", "Mumbai", "Bangalore", "New Delhi", "Chennai", "Kolkata", "Goa", "Pune"]
+TEMPLATES = [
+    "Book flight for {name} from {a} to {b} on {date} at {time}",
+    "I want to reserve a ticket from {a} to {b} on {date} {time}. Name is {name}",
+    "Please cancel my booking {ref}",
+    "Reschedule {ref} to {date} {time}",
+    "book a ticket from {a} to {b} tomorrow, passenger is {name}",
+    "can you change {ref} to {date} at {time} please",
+    "What is the weather like in Paris?",
+    "I need help with my luggage options",
+]
+
+
+def make_corpus(n, seed=7):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        a, b = rnd.sample(PLACES, 2)
+        mo, d, h, mi = rnd.randint(1, 12), rnd.randint(1, 28), rnd.randint(1, 12), rnd.randint(0, 59)
+        date = rnd.choice([f"2025-{mo:02d}-{d:02d}", f"{d}/{mo}/2025", f"{d}-{mo}-2025"])
+        time_ = rnd.choice([f"{h:02d}:{mi:02d}", f"{h}:{mi:02d} am", f"{h}:{mi:02d} PM"])
+        ref = f"BK-202510{rnd.randint(10, 28)}-{rnd.getrandbits(32):08x}"
+        out.append(rnd.choice(TEMPLATES).format(name=rnd.choice(NAMES), a=a, b=b, date=date, time=time_, ref=ref))
+    return out
+
+
+def bench(fn, corpus, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(corpus)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.messages)
+    get_gazetteer()  # build the trie outside the timed region
+
+    mismatches, ref_diffs = 0, 0
+    for m in corpus:
+        base, scan = baseline_slot_extraction(m), scan_slots(m)
+        ref_diffs += base.pop("booking_reference") != scan.pop("booking_reference")
+        mismatches += base != scan
+    print(f"{len(corpus)} messages, {mismatches} with different results (booking_reference not compared)")
+    print(f"{ref_diffs} booking references extracted differently (the baseline truncates hyphenated references)")
+
+    base = bench(lambda c: [baseline_slot_extraction(m) for m in c], corpus, args.repeat)
+    scan = bench(scan_slots_batch, corpus, args.repeat)
+    for label, secs in (("sequential regex", base), ("single-pass scanner", scan)):
+        print(f"{label:>20}: {secs:.3f}s  {len(corpus) / secs:,.0f} msg/s  {secs / len(corpus) * 1e6:.1f} us/msg")
+    print(f"{'speedup':>20}: {base / scan:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Latency and accuracy of the NLU pipeline over a labeled corpus, per configuration.
+
+Every message in the corpus (mcp_server/data/nlu_eval.jsonl by default) goes through
+generate_intent, regex_slot_extraction, extract_slots and handle_message. For each
+stage the report gives p50/p95/p99 latency, LLM requests per message, and intent
+and slot accuracy against the labels. The same corpus runs under several modes:
+
+    mock    USE_MOCK_LLM: keyword intent rules and regex slots, no LLM
+    regex   no LLM at all: local intent classifier for every message, regex slots only
+    stub    the real LLM path against mcp_server.llm_stub, response cache off
+    cached  like stub with the LLM response cache on, measured after one warm-up pass
+
+    python scripts/eval_nlu.py [--modes mock,regex,stub,cached] [--output nlu-eval.json]
+
+The corpus must be held out from the local intent classifier's training corpus
+(--train-corpus); the run stops if any message appears in both.
+
+Each mode runs in its own interpreter, because the pipeline reads its configuration
+from the environment at import time. Backend tools run in-process against a temporary
+SQLite database (TOOLS_TRANSPORT=inprocess).
+"""
+import os
+import sys
+import json
+import math
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+DEFAULT_CORPUS = os.path.join(ROOT, "mcp_server", "data", "nlu_eval.jsonl")
+TRAIN_CORPUS = os.path.join(ROOT, "mcp_server", "data", "intent_corpus.jsonl")
+MODES = ("mock", "regex", "stub", "cached")
+STAGES = ("intent", "regex_slots", "slots", "handle_message")
+SLOT_KEYS = ("passenger_name", "origin", "destination", "date", "time", "booking_reference")
+
+
+# ----------------- WORKER (one mode, own process) -----------------
+def count_llm_requests(counter: list):
+    """Count requests that reach the LLM endpoint (cache hits and local answers never do)."""
+    from mcp_server import llm_client
+
+    def counting(fn):
+        def wrapper(*args, **kwargs):
+            counter[0] += 1
+            return fn(*args, **kwargs)
+        return wrapper
+    llm_client.post_json = counting(llm_client.post_json)
+    llm_client.stream_sse = counting(llm_client.stream_sse)
+
+
+def run_worker(mode: str, corpus_path: str, repeat: int) -> dict:
+    from backend.app.db import Base, engine
+    import backend.app.models  # noqa: F401  (registers the tables)
+    from mcp_server import mcp, llm_adapter
+
+    Base.metadata.create_all(bind=engine)
+    calls = [0]
+    count_llm_requests(calls)
+    if mode == "regex":
+        mcp.USE_LLM_FOR_SLOTS = False
+
+    stages = {
+        "intent": llm_adapter.generate_intent,
+        "regex_slots": mcp.regex_slot_extraction,
+        "slots": mcp.extract_slots,
+        "handle_message": mcp.handle_message,
+    }
+    corpus = load_corpus(corpus_path)
+    if mode == "cached":
+        for example in corpus:
+            for fn in stages.values():
+                fn(example["text"])
+
+    samples = {stage: {"latency": [], "calls": 0, "intent_ok": 0, "slot_ok": 0, "exact": 0, "n": 0} for stage in STAGES}
+    for _ in range(repeat):
+        for example in corpus:
+            expected = {k: example["slots"].get(k, "") for k in SLOT_KEYS}
+            for stage, fn in stages.items():
+                before = calls[0]
+                start = time.perf_counter()
+                out = fn(example["text"])
+                elapsed = time.perf_counter() - start
+                s = samples[stage]
+                s["latency"].append(elapsed)
+                s["calls"] += calls[0] - before
+                s["n"] += 1
+                intent, slots = None, None
+                if stage == "intent":
+                    intent = out
+                elif stage == "handle_message":
+                    intent, slots = out["intent"], out["slots"]
+                else:
+                    slots = out
+                if intent is not None:
+                    s["intent_ok"] += intent == example["intent"]
+                if slots is not None:
+                    matched = sum((slots.get(k) or "").strip() == expected[k] for k in SLOT_KEYS)
+                    s["slot_ok"] += matched
+                    s["exact"] += matched == len(SLOT_KEYS)
+
+    report = {}
+    for stage, s in samples.items():
+        values = sorted(s["latency"])
+        row = {
+            "messages": s["n"],
+            "latency_ms": {
+                "mean": round(sum(values) / len(values) * 1000, 3),
+                "p50": round(percentile(values, 50) * 1000, 3),
+                "p95": round(percentile(values, 95) * 1000, 3),
+                "p99": round(percentile(values, 99) * 1000, 3),
+            },
+            "llm_calls_per_message": round(s["calls"] / s["n"], 3),
+        }
+        if stage in ("intent", "handle_message"):
+            row["intent_accuracy"] = round(s["intent_ok"] / s["n"], 4)
+        if stage != "intent":
+            row["slot_accuracy"] = round(s["slot_ok"] / (s["n"] * len(SLOT_KEYS)), 4)
+            row["slots_exact"] = round(s["exact"] / s["n"], 4)
+        report[stage] = row
+    return {"stages": report, "local_intent": llm_adapter.local_intent_stats(), "llm_cache": llm_adapter.cache_stats()}
+
+
+# ----------------- DRIVER -----------------
+def load_corpus(path: str):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def training_overlap(corpus_path: str, train_path: str):
+    """Eval messages that also appear (ignoring case and spacing) in the classifier's training data."""
+    def norm(text):
+        return " ".join(text.lower().split())
+    trained = {norm(example["text"]) for example in load_corpus(train_path)}
+    return [example["text"] for example in load_corpus(corpus_path) if norm(example["text"]) in trained]
+
+
+def percentile(sorted_values, q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_stub(latency_ms: float):
+    port = free_port()
+    env = dict(os.environ, LLM_STUB_PORT=str(port), LLM_STUB_LATENCY_MS=str(latency_ms), LLM_STUB_JITTER_MS="0",
+               LLM_STUB_ERROR_RATE="0", USE_MOCK_LLM="false")
+    stub = subprocess.Popen([sys.executable, "-m", "mcp_server.llm_stub"], cwd=ROOT, env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if stub.poll() is not None:
+            raise SystemExit(f"LLM stub exited with status {stub.returncode}")
+        try:
+            if requests.get(url + "/openapi.json", timeout=1).status_code == 200:
+                return stub, url + "/v1/chat/completions"
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    stub.terminate()
+    raise SystemExit("LLM stub not ready after 30s")
+
+
+def mode_env(mode: str, workdir: str, stub_url: str) -> dict:
+    env = dict(os.environ, TOOLS_TRANSPORT="inprocess", DB_PROFILE="production",
+               DATABASE_URL=f"sqlite:///{os.path.join(workdir, mode + '.db')}", LLM_CACHE_ENABLED="false")
+    if mode == "mock":
+        env.update(USE_MOCK_LLM="true")
+    elif mode == "regex":
+        env.update(USE_MOCK_LLM="false", OPENAI_API_KEY="", LOCAL_INTENT_ENABLED="true", LOCAL_INTENT_THRESHOLD="0")
+    else:
+        env.update(USE_MOCK_LLM="false", OPENAI_API_KEY="stub", OPENAI_API_URL=stub_url)
+        if mode == "cached":
+            env.update(LLM_CACHE_ENABLED="true", LLM_CACHE_PATH=os.path.join(workdir, "llm-cache.sqlite"))
+    return env
+
+
+def run_mode(mode: str, args, workdir: str, stub_url: str) -> dict:
+    result_file = os.path.join(workdir, mode + ".json")
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", mode, "--corpus", args.corpus,
+           "--repeat", str(args.repeat), "--result-file", result_file]
+    # the pipeline prints diagnostics to stdout; keep them out of the report unless asked for
+    out = None if args.verbose else subprocess.DEVNULL
+    subprocess.run(cmd, cwd=ROOT, env=mode_env(mode, workdir, stub_url), stdout=out, check=True)
+    with open(result_file) as f:
+        return json.load(f)
+
+
+def print_report(results: dict):
+    print(f"{'mode':>7} {'stage':>15} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'llm/msg':>8} {'intent':>7} {'slots':>7} {'exact':>7}")
+    for mode, result in results.items():
+        for stage, row in result["stages"].items():
+            lat = row["latency_ms"]
+            intent = f"{row['intent_accuracy']:.1%}" if "intent_accuracy" in row else "-"
+            slots = f"{row['slot_accuracy']:.1%}" if "slot_accuracy" in row else "-"
+            exact = f"{row['slots_exact']:.1%}" if "slots_exact" in row else "-"
+            print(f"{mode:>7} {stage:>15} {lat['p50']:>9.3f} {lat['p95']:>9.3f} {lat['p99']:>9.3f} "
+                  f"{row['llm_calls_per_message']:>8.2f} {intent:>7} {slots:>7} {exact:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--train-corpus", default=TRAIN_CORPUS, help="corpus the local intent model was trained on")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the corpus per mode")
+    parser.add_argument("--stub-latency-ms", type=float, default=50, help="LLM stub time to answer")
+    parser.add_argument("--output", default="nlu-eval.json")
+    parser.add_argument("--verbose", action="store_true", help="show the pipeline's own output")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args.worker, args.corpus, args.repeat)
+        with open(args.result_file, "w") as f:
+            json.dump(result, f)
+        return
+
+    overlap = training_overlap(args.corpus, args.train_corpus)
+    if overlap:
+        parser.error("eval corpus overlaps the intent training corpus:\n  " + "\n  ".join(overlap))
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown mode(s): {', '.join(sorted(unknown))}")
+    workdir = tempfile.mkdtemp(prefix="nlu-eval-")
+    stub, stub_url = (None, "")
+    if {"stub", "cached"} & set(modes):
+        stub, stub_url = start_stub(args.stub_latency_ms)
+    try:
+        results = {mode: run_mode(mode, args, workdir, stub_url) for mode in modes}
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait(timeout=30)
+
+    print_report(results)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "corpus": os.path.relpath(args.corpus, ROOT),
+            "messages": len(load_corpus(args.corpus)),
+            "repeat": args.repeat,
+            "stub_latency_ms": args.stub_latency_ms,
+        },
+        "modes": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
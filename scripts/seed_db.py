@@ -1,2 +1,216 @@
-# Script to seed the database
+"""
+Seed the bookings table with a deterministic, production-sized synthetic data set.
 
+    python scripts/seed_db.py --rows 5000000 [--seed 42] [--chunk 20000] [--truncate]
+    DATABASE_URL=postgresql://app@localhost/flights python scripts/seed_db.py --rows 20000000
+
+Rows are generated lazily and written in chunks, so memory stays flat however many rows
+are requested. Data follows skewed route popularity (hub airports), weekly seasonality
+in travel dates, a daily departure bank and a status mix of confirmed, cancelled and
+rescheduled bookings. The same --seed always produces the same rows.
+
+Loading uses COPY on PostgreSQL (psycopg2) and executemany INSERTs elsewhere. The
+secondary bookings indexes are dropped before the load and rebuilt once afterwards,
+which is far cheaper than maintaining them row by row; --keep-indexes skips that. The
+unique booking_reference index stays in place throughout (references are sequential
+per seed, so it only ever appends), and a seed already present in the table is refused
+up front unless --truncate is given.
+"""
+import io
+import os
+import sys
+import csv
+import time
+import random
+import argparse
+import traceback
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from itertools import accumulate, islice
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# (code, relative traffic); hubs first
+AIRPORTS = [
+    ("DEL", 30), ("BOM", 28), ("BLR", 22), ("HYD", 12), ("MAA", 12), ("CCU", 10), ("GOI", 7), ("PNQ", 6),
+    ("AMD", 6), ("COK", 5), ("JAI", 4), ("LKO", 4), ("GAU", 3), ("TRV", 3), ("IXC", 2), ("PAT", 2),
+    ("BBI", 2), ("NAG", 2), ("IDR", 2), ("SXR", 1),
+]
+# departure bank: morning and evening peaks
+DEPARTURES = [(dtime(h, m), w) for h, m, w in (
+    (6, 0, 8), (7, 15, 10), (8, 30, 9), (10, 0, 6), (11, 45, 4), (13, 30, 4), (15, 0, 5),
+    (16, 45, 6), (18, 0, 9), (19, 30, 10), (21, 0, 7), (22, 45, 3),
+)]
+CLASSES = [("Economy", 85), ("Premium Economy", 5), ("Business", 10)]
+FIRST_NAMES = ["Aarav", "Asha", "Arjun", "Divya", "Ishaan", "Kavya", "Meera", "Neha", "Priya", "Rahul",
+               "Rohan", "Sanjay", "Sneha", "Vaishak", "Vikram", "Ananya", "Karan", "Pooja", "Nikhil", "Riya"]
+LAST_NAMES = ["Rao", "Nair", "Mehta", "Gupta", "Iyer", "Das", "Pillai", "Sharma", "Reddy", "Shah",
+              "Menon", "Kapoor", "Joshi", "Bose", "Kulkarni", "Singh", "Verma", "Chopra", "Patel", "Sen"]
+# weekday multipliers, Monday first: Friday and Sunday are the busiest travel days
+WEEKDAY_WEIGHT = (1.0, 0.8, 0.8, 0.9, 1.3, 1.0, 1.25)
+
+COLUMNS = ("passenger_name", "origin", "destination", "date", "time", "status", "booking_reference",
+           "created_at", "updated_at", "version", "flight_class")
+
+
+def _sampler(rnd: random.Random, weighted):
+    values, weights = zip(*weighted)
+    cum = list(accumulate(weights))
+    return lambda: rnd.choices(values, cum_weights=cum)[0]
+
+
+def parse_status_mix(text: str):
+    mix = []
+    for part in text.split(","):
+        status, _, weight = part.partition("=")
+        mix.append((status.strip().upper(), float(weight)))
+    return mix
+
+
+def generate_rows(count: int, seed: int, start: date, days: int, status_mix):
+    """Yield `count` booking dicts, deterministically for a given seed."""
+    rnd = random.Random(seed)
+    airport = _sampler(rnd, AIRPORTS)
+    departure = _sampler(rnd, DEPARTURES)
+    flight_class = _sampler(rnd, CLASSES)
+    status = _sampler(rnd, status_mix)
+    travel_day = _sampler(rnd, [(d, WEEKDAY_WEIGHT[(start + timedelta(days=d)).weekday()]) for d in range(days)])
+    epoch = datetime.combine(start, dtime(), tzinfo=timezone.utc)
+
+    for i in range(count):
+        origin = airport()
+        destination = airport()
+        while destination == origin:
+            destination = airport()
+        day = travel_day()
+        # booked 0-90 days ahead of travel, most of them within the last three weeks
+        booked_at = epoch + timedelta(days=day) - timedelta(seconds=int(rnd.expovariate(1 / (21 * 86400))) % (90 * 86400))
+        st = status()
+        version = 1 if st == "CONFIRMED" else 2 + (rnd.random() < 0.15)
+        yield {
+            "passenger_name": f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}",
+            "origin": origin,
+            "destination": destination,
+            "date": start + timedelta(days=day),
+            "time": departure(),
+            "status": st,
+            # unique per (seed, row); matches the booking-reference pattern the MCP layer extracts
+            "booking_reference": f"{reference_prefix(seed)}{i:012d}",
+            "created_at": booked_at,
+            "updated_at": None if version == 1 else booked_at + timedelta(hours=rnd.randint(1, 240)),
+            "version": version,
+            "flight_class": flight_class(),
+        }
+
+
+def reference_prefix(seed: int) -> str:
+    return f"BK{seed:04X}S"
+
+
+def chunks(rows, size: int):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def copy_chunk(conn, table: str, chunk, buf: io.StringIO):
+    """PostgreSQL COPY ... FROM STDIN for one chunk, through a reused in-memory CSV buffer."""
+    buf.seek(0)
+    buf.truncate()
+    writer = csv.writer(buf)
+    for row in chunk:
+        writer.writerow(["" if row[c] is None else row[c] for c in COLUMNS])
+    buf.seek(0)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table} ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv, NULL '')", buf)
+    finally:
+        cursor.close()
+
+
+def rebuild_indexes(engine, indexes) -> list:
+    """Create each index in its own transaction, so one failure leaves the others in place."""
+    failed, started = [], time.perf_counter()
+    for ix in indexes:
+        try:
+            with engine.begin() as conn:
+                ix.create(conn, checkfirst=True)
+        except Exception:
+            traceback.print_exc()
+            failed.append(ix.name)
+    if indexes:
+        print(f"rebuilt {len(indexes) - len(failed)}/{len(indexes)} indexes in {time.perf_counter() - started:.1f}s")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk", type=int, default=20_000, help="rows per INSERT batch / COPY")
+    parser.add_argument("--start-date", type=date.fromisoformat, default=date(2025, 1, 1))
+    parser.add_argument("--days", type=int, default=365, help="travel dates span this many days from --start-date")
+    parser.add_argument("--status-mix", type=parse_status_mix, default=parse_status_mix("confirmed=80,cancelled=12,rescheduled=8"))
+    parser.add_argument("--database-url", help="defaults to DATABASE_URL / the app's database")
+    parser.add_argument("--truncate", action="store_true", help="delete existing bookings first")
+    parser.add_argument("--keep-indexes", action="store_true", help="maintain indexes during the load")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    from sqlalchemy import insert, select, text
+    from backend.app.db import Base, engine
+    from backend.app import models
+
+    table = models.Booking.__table__
+    Base.metadata.create_all(bind=engine)
+    dialect = engine.dialect.name
+    use_copy = dialect == "postgresql" and engine.dialect.driver == "psycopg2"
+    indexes = [] if args.keep_indexes else sorted((ix for ix in table.indexes if not ix.unique), key=lambda ix: ix.name)
+
+    if not args.truncate:
+        with engine.connect() as conn:
+            # every run of a seed starts with row 0; an indexed point lookup instead of a LIKE scan
+            taken = conn.execute(select(table.c.id).where(table.c.booking_reference == f"{reference_prefix(args.seed)}{0:012d}")).first()
+        if taken is not None:
+            sys.exit(f"bookings from --seed {args.seed} are already loaded; pass --truncate or another --seed")
+
+    with engine.begin() as conn:
+        if args.truncate:
+            conn.execute(table.delete())
+        for ix in indexes:
+            ix.drop(conn, checkfirst=True)
+    print(f"loading {args.rows:,} bookings into {dialect} ({'COPY' if use_copy else 'executemany'}, "
+          f"{len(indexes)} secondary indexes deferred)")
+
+    rows = generate_rows(args.rows, args.seed, args.start_date, args.days, args.status_mix)
+    insert_stmt = insert(table)
+    buf = io.StringIO()
+    loaded, started = 0, time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            if dialect == "sqlite":
+                # bulk-load settings for this connection only; the file stays consistent, it just skips fsyncs
+                conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            for chunk in chunks(rows, args.chunk):
+                if use_copy:
+                    copy_chunk(conn, table.name, chunk, buf)
+                else:
+                    conn.execute(insert_stmt, chunk)
+                conn.commit()
+                loaded += len(chunk)
+                elapsed = time.perf_counter() - started
+                print(f"\r{loaded:,} rows  {loaded / elapsed:,.0f} rows/s", end="", flush=True)
+    finally:
+        print()
+        failed = rebuild_indexes(engine, indexes)
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE" if dialect == "sqlite" else f"ANALYZE {table.name}"))
+    print(f"done: {loaded:,} rows in {time.perf_counter() - started:.1f}s")
+    if failed:
+        sys.exit(f"could not rebuild: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()